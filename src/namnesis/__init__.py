@@ -33,7 +33,11 @@ __all__ = [
     "CompressionResult",
     "CompressionError",
     "compress_files",
+    "compress_files_to_path",
+    "compress_files_to_stream",
     "decompress_archive",
+    "decompress_archive_from_stream",
+    "train_dictionary",
     # Crypto (signing only)
     "CryptoError",
     "SignatureError",
@@ -84,7 +88,11 @@ from .anamnesis.compression import (
     CompressionOptions,
     CompressionResult,
     compress_files,
+    compress_files_to_path,
+    compress_files_to_stream,
     decompress_archive,
+    decompress_archive_from_stream,
+    train_dictionary,
 )
 from .spec.models import CapsuleManifest, RedactionReport, RestoreReport
 from .spec.redaction import RedactionPolicy
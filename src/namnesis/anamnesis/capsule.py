@@ -12,9 +12,12 @@ from __future__ import annotations
 
 import json
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, BinaryIO, Optional
 
 from ..sigil.crypto import (
     CryptoError,
@@ -27,14 +30,25 @@ from ..spec.models import CapsuleManifest, RedactionReport, RestoreReport
 from ..spec.redaction import RedactionPolicy
 from ..spec.schemas import SchemaValidationError
 from .compression import (
+    ARCHIVE_FORMATS,
+    SPOOL_MAX_BYTES,
     CompressionError,
     CompressionOptions,
     CompressionResult,
-    compress_files,
-    decompress_archive,
+    compress_files_to_stream,
+    decompress_archive_from_stream,
 )
-from .storage import EcdsaPresignedUrlBackend, LocalDirBackend, PresignedUrlBackend, S3Backend, StorageBackend
-from ..utils import sha256_hex, utc_now_rfc3339, uuidv7
+from .storage import (
+    BATCH_MAX_WORKERS,
+    EcdsaPresignedUrlBackend,
+    LocalDirBackend,
+    PresignedUrlBackend,
+    S3Backend,
+    StorageBackend,
+    put_blobs,
+    write_session,
+)
+from ..utils import sha256_hex, sha256_hex_iter, utc_now_rfc3339, uuidv7
 
 
 class CapsuleError(RuntimeError):
@@ -104,6 +118,7 @@ class ImportOptions:
     overwrite: bool = False
     partial: bool = False
     restore_report_path: Path | None = None
+    compression_dictionary: bytes | None = None  # zstd dictionary used at export
 
 
 @dataclass(frozen=True)
@@ -171,93 +186,116 @@ def export_capsule(options: ExportOptions) -> tuple[str, dict[str, Any]]:
     blobs: list[dict[str, Any]] = []
     compression_info: dict[str, Any] = {"enabled": False}
 
-    if options.compression.enabled and included_files:
-        # === Compressed mode: single 7z archive blob ===
-        try:
-            compress_result = compress_files(
-                workspace=options.workspace,
-                file_paths=included_files,
-                options=options.compression,
-            )
-        except CompressionError as exc:
-            raise CapsuleError(f"Compression failed: {exc}") from exc
-
-        data = compress_result.archive_data
-        bid = blob_id(data)
-        ref = options.backend.put_blob(capsule_id, bid, data)
-
-        blobs.append({
-            "blob_id": bid,
-            "hash": bid,
-            "size_bytes": len(data),
-            "storage": {"backend": _backend_name(options.backend), "ref": ref},
-            "is_archive": True,
-            "archive_format": "7z",
-        })
-
-        for decision in report["decisions"]:
-            if decision["decision"] == "exclude":
-                continue
-            rel_path = decision["path"]
-            full_path = options.workspace / rel_path
-            payload = full_path.read_bytes()
-            artifacts.append({
-                "path": rel_path,
-                "kind": artifact_kind(rel_path),
-                "mode": decision["decision"],
-                "plaintext_hash": sha256_hex(payload),
-                "size_bytes": len(payload),
-                "blob_id": bid,
-            })
+    with ExitStack() as stack:
+        archive: Optional[BinaryIO] = None
+        uploads: dict[str, bytes] = {}
+
+        if options.compression.enabled and included_files:
+            # === Compressed mode: single archive blob (7z or zstd tar) ===
+            # The archive is spooled (RAM for small capsules, disk beyond that)
+            # and streamed to the backend instead of materialized as bytes.
+            archive = stack.enter_context(tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES))
+            try:
+                compress_result = compress_files_to_stream(
+                    workspace=options.workspace,
+                    file_paths=included_files,
+                    options=options.compression,
+                    out_stream=archive,
+                )
+            except CompressionError as exc:
+                raise CapsuleError(f"Compression failed: {exc}") from exc
+
+            archive.seek(0)
+            bid = sha256_hex_iter(iter(lambda: archive.read(1 << 20), b""))
 
-        compression_info = {
-            "enabled": True,
-            "algorithm": options.compression.algorithm,
-            "level": options.compression.level,
-            "original_size_bytes": compress_result.original_size,
-            "compressed_size_bytes": compress_result.compressed_size,
-            "compression_ratio": round(compress_result.compression_ratio, 4),
-        }
-    else:
-        # === Default mode: one blob per file ===
-        for decision in report["decisions"]:
-            if decision["decision"] == "exclude":
-                continue
-            rel_path = decision["path"]
-            full_path = options.workspace / rel_path
-            payload = full_path.read_bytes()
-            bid = blob_id(payload)
-            ref = options.backend.put_blob(capsule_id, bid, payload)
             blobs.append({
                 "blob_id": bid,
                 "hash": bid,
-                "size_bytes": len(payload),
-                "storage": {"backend": _backend_name(options.backend), "ref": ref},
-            })
-            artifacts.append({
-                "path": rel_path,
-                "kind": artifact_kind(rel_path),
-                "mode": decision["decision"],
-                "plaintext_hash": sha256_hex(payload),
-                "size_bytes": len(payload),
-                "blob_id": bid,
+                "size_bytes": compress_result.compressed_size,
+                "storage": {"backend": _backend_name(options.backend)},
+                "is_archive": True,
+                "archive_format": ARCHIVE_FORMATS[options.compression.algorithm],
             })
 
-    manifest = build_manifest(
-        capsule_id=capsule_id,
-        artifacts=artifacts,
-        blobs=blobs,
-        policy_version=options.policy.policy_version,
-        compression=compression_info,
-        access=options.access,
-    )
-    manifest["signature"] = sign_manifest(manifest, options.private_key_hex)
-
-    CapsuleManifest.from_dict(manifest)
-    RedactionReport.from_dict(report)
-
-    _write_redaction_report(options.backend, capsule_id, report)
-    _write_manifest(options.backend, capsule_id, manifest)
+            for decision in report["decisions"]:
+                if decision["decision"] == "exclude":
+                    continue
+                rel_path = decision["path"]
+                full_path = options.workspace / rel_path
+                artifacts.append({
+                    "path": rel_path,
+                    "kind": artifact_kind(rel_path),
+                    "mode": decision["decision"],
+                    "plaintext_hash": sha256_hex_iter(_iter_file_chunks(full_path)),
+                    "size_bytes": full_path.stat().st_size,
+                    "blob_id": bid,
+                })
+
+            compression_info = {
+                "enabled": True,
+                "algorithm": options.compression.algorithm,
+                "level": options.compression.level,
+                "original_size_bytes": compress_result.original_size,
+                "compressed_size_bytes": compress_result.compressed_size,
+                "compression_ratio": round(compress_result.compression_ratio, 4),
+            }
+            if options.compression.dictionary is not None:
+                # Importers must supply the same dictionary; record which one
+                compression_info["dictionary_sha256"] = sha256_hex(options.compression.dictionary)
+        else:
+            # === Default mode: one blob per file ===
+            # Blobs are uploaded together so remote backends can parallelize.
+            for decision in report["decisions"]:
+                if decision["decision"] == "exclude":
+                    continue
+                rel_path = decision["path"]
+                full_path = options.workspace / rel_path
+                payload = full_path.read_bytes()
+                bid = blob_id(payload)
+                uploads.setdefault(bid, payload)
+                blobs.append({
+                    "blob_id": bid,
+                    "hash": bid,
+                    "size_bytes": len(payload),
+                    "storage": {"backend": _backend_name(options.backend)},
+                })
+                artifacts.append({
+                    "path": rel_path,
+                    "kind": artifact_kind(rel_path),
+                    "mode": decision["decision"],
+                    "plaintext_hash": sha256_hex(payload),
+                    "size_bytes": len(payload),
+                    "blob_id": bid,
+                })
+
+        # One write session covers every blob and both documents, so presigned
+        # backends fetch all upload URLs in a single request.
+        blob_ids = list(dict.fromkeys(blob["blob_id"] for blob in blobs))
+        sink = stack.enter_context(write_session(options.backend, capsule_id, blob_ids))
+
+        if archive is not None:
+            archive.seek(0)
+            refs = {blob_ids[0]: sink.put_blob_stream(capsule_id, blob_ids[0], archive)}
+        else:
+            refs = dict(zip(uploads, put_blobs(sink, capsule_id, list(uploads.items()))))
+        for blob in blobs:
+            blob["storage"]["ref"] = refs[blob["blob_id"]]
+
+        manifest = build_manifest(
+            capsule_id=capsule_id,
+            artifacts=artifacts,
+            blobs=blobs,
+            policy_version=options.policy.policy_version,
+            compression=compression_info,
+            access=options.access,
+        )
+        manifest["signature"] = sign_manifest(manifest, options.private_key_hex)
+
+        CapsuleManifest.from_dict(manifest)
+        RedactionReport.from_dict(report)
+
+        _write_redaction_report(sink, capsule_id, report)
+        _write_manifest(sink, capsule_id, manifest)
     return capsule_id, manifest
 
 
@@ -290,13 +328,22 @@ def import_capsule(options: ImportOptions) -> dict[str, Any]:
         if not archive_blob:
             raise BlobInvalidError("Compressed capsule missing archive blob.")
 
-        data = _get_and_verify_blob(options.backend, archive_blob)
+        _check_compression_dictionary(compression, options.compression_dictionary)
 
-        try:
-            expected_files = [a["path"] for a in manifest["artifacts"]]
-            decompress_archive(data, options.target_workspace, expected_files)
-        except CompressionError as exc:
-            raise RestoreFailedError(f"Failed to extract archive: {exc}") from exc
+        # The archive is spooled and hashed in one pass, then extracted from
+        # the verified spool without materializing it as bytes.
+        with _open_verified_blob(options.backend, archive_blob) as archive:
+            try:
+                expected_files = [a["path"] for a in manifest["artifacts"]]
+                decompress_archive_from_stream(
+                    archive,
+                    options.target_workspace,
+                    expected_files,
+                    algorithm=compression.get("algorithm", "7z"),
+                    dictionary=options.compression_dictionary,
+                )
+            except CompressionError as exc:
+                raise RestoreFailedError(f"Failed to extract archive: {exc}") from exc
 
         for artifact in manifest["artifacts"]:
             path = artifact["path"]
@@ -365,8 +412,22 @@ def validate_capsule(options: ValidateOptions) -> None:
 
     _verify_manifest_or_raise(manifest, options.trusted_fingerprints)
 
-    for b in manifest["blobs"]:
-        _get_and_verify_blob(options.backend, b)
+    blobs = manifest["blobs"]
+    if len(blobs) <= 1:
+        for b in blobs:
+            _check_blob_stream(options.backend, b)
+        return
+    # Each worker hashes its blob as it streams in and keeps nothing, so
+    # memory stays bounded by the workers' read buffers, not the capsule size
+    with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(blobs))) as executor:
+        futures = [executor.submit(_check_blob_stream, options.backend, b) for b in blobs]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
 
 
 # ============ Manifest Builder ============
@@ -480,9 +541,66 @@ def _get_and_verify_blob(backend: StorageBackend, blob_entry: dict[str, Any]) ->
         data = backend.get_blob(blob_entry["storage"]["ref"])
     except FileNotFoundError as exc:
         raise BlobInvalidError("Missing blob.") from exc
+    _verify_blob_hash(blob_entry, data)
+    return data
+
+
+def _open_verified_blob(backend: StorageBackend, blob_entry: dict[str, Any]) -> BinaryIO:
+    """Download a blob into a spooled temp file, verifying its hash on the way.
+
+    Returns the spool positioned at the start; the caller must close it.
+    """
+    try:
+        src = backend.get_blob_stream(blob_entry["storage"]["ref"])
+    except FileNotFoundError as exc:
+        raise BlobInvalidError("Missing blob.") from exc
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        try:
+            digest = sha256_hex_iter(_tee_chunks(src, spool))
+        finally:
+            src.close()
+        if digest != blob_entry["blob_id"]:
+            raise BlobInvalidError("Blob hash mismatch.")
+        spool.seek(0)
+        return spool
+    except BaseException:
+        spool.close()
+        raise
+
+
+def _check_blob_stream(backend: StorageBackend, blob_entry: dict[str, Any]) -> None:
+    """Verify a stored blob's hash by streaming it, without keeping the payload."""
+    try:
+        src = backend.get_blob_stream(blob_entry["storage"]["ref"])
+    except FileNotFoundError as exc:
+        raise BlobInvalidError("Missing blob.") from exc
+    try:
+        digest = sha256_hex_iter(iter(lambda: src.read(1 << 20), b""))
+    finally:
+        src.close()
+    if digest != blob_entry["blob_id"]:
+        raise BlobInvalidError("Blob hash mismatch.")
+
+
+def _verify_blob_hash(blob_entry: dict[str, Any], data: bytes) -> None:
     if sha256_hex(data) != blob_entry["blob_id"]:
         raise BlobInvalidError("Blob hash mismatch.")
-    return data
+
+
+def _check_compression_dictionary(compression: dict[str, Any], dictionary: Optional[bytes]) -> None:
+    expected = compression.get("dictionary_sha256")
+    if expected is None:
+        return
+    if dictionary is None:
+        raise RestoreFailedError(
+            f"Capsule archive was compressed with a zstd dictionary (sha256 {expected}); "
+            "pass it as ImportOptions.compression_dictionary."
+        )
+    if sha256_hex(dictionary) != expected:
+        raise RestoreFailedError(
+            f"Compression dictionary does not match the one used at export (sha256 {expected})."
+        )
 
 
 def _verify_manifest_or_raise(manifest: dict[str, Any], trusted_addresses: set[str]) -> None:
@@ -492,6 +610,19 @@ def _verify_manifest_or_raise(manifest: dict[str, Any], trusted_addresses: set[s
         raise SignatureInvalidError(str(exc)) from exc
 
 
+def _iter_file_chunks(path: Path, chunk_size: int = 1 << 20):
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            yield chunk
+
+
+def _tee_chunks(src: BinaryIO, sink: BinaryIO, chunk_size: int = 1 << 20):
+    """Yield chunks read from ``src`` after copying each into ``sink``."""
+    while chunk := src.read(chunk_size):
+        sink.write(chunk)
+        yield chunk
+
+
 def _json_bytes(payload: dict[str, Any]) -> bytes:
     return (json.dumps(payload, indent=2, sort_keys=True) + "\n").encode("utf-8")
 
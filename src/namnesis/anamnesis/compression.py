@@ -1,31 +1,76 @@
 """
-7z Compression Module
+Compression Module
 
-Provides file compression/decompression using 7z format for efficient
-capsule storage (typically 60-80% space savings for text files).
+Provides file compression/decompression for efficient capsule storage
+(typically 60-80% space savings for text files). Archives are 7z by
+default; zstd-compressed tar (optionally with a trained dictionary) is
+available when ``zstandard`` is installed.
 """
 
 from __future__ import annotations
 
+import hashlib
 import io
+import math
+import shutil
+import tarfile
+import tempfile
+import threading
+from collections import Counter
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Optional
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import BinaryIO, Iterable, Literal, Optional
 
-# Lazy import check for py7zr
-_HAS_7Z: Optional[bool] = None
+# Archives up to this size stay in RAM while being built; larger ones spill to disk.
+SPOOL_MAX_BYTES = 8 << 20
+
+# Samples whose byte entropy (bits/byte, max 8.0) exceeds this are treated as
+# already compressed or encrypted; estimate_compression_ratio skips 7z for them.
+INCOMPRESSIBLE_ENTROPY_THRESHOLD = 7.5
+_ENTROPY_PROBE_BYTES = 4096
+_INCOMPRESSIBLE_RATIO = 0.99
+_RATIO_CACHE_MAX = 256
+_ratio_cache: dict[bytes, float] = {}
+_ratio_cache_lock = threading.Lock()
+
+# LZMA2 dictionary sizes. py7zr's default preset reserves a multi-MiB
+# dictionary per archive, far more than typical capsule text needs.
+ARCHIVE_DICT_SIZE = 1 << 20
+_SAMPLE_DICT_SIZE = 64 << 10
+
+# py7zr is optional; None when not installed
+try:
+    import py7zr as _PY7ZR
+except ImportError:
+    _PY7ZR = None
+
+
+# zstandard is optional; None when not installed
+try:
+    import zstandard as _ZSTD
+except ImportError:
+    _ZSTD = None
+
+# Manifest ``archive_format`` recorded for each algorithm
+ARCHIVE_FORMATS = {"7z": "7z", "zstd": "tar.zst"}
+DEFAULT_DICTIONARY_SIZE = 64 << 10
+
+# Extraction refuses archives that would expand beyond this many bytes
+MAX_UNCOMPRESSED_BYTES = 1 << 30
 
 
 def _check_7z_available() -> bool:
     """Check if py7zr is available."""
-    global _HAS_7Z
-    if _HAS_7Z is None:
-        try:
-            import py7zr  # noqa: F401
-            _HAS_7Z = True
-        except ImportError:
-            _HAS_7Z = False
-    return _HAS_7Z
+    return _PY7ZR is not None
+
+
+def _check_zstd_available() -> bool:
+    """Check if zstandard is available."""
+    return _ZSTD is not None
+
+
+def _lzma2_filters(level: int, dict_size: int) -> list[dict]:
+    return [{"id": _PY7ZR.FILTER_LZMA2, "preset": level, "dict_size": dict_size}]
 
 
 class CompressionError(RuntimeError):
@@ -40,22 +85,36 @@ class CompressionOptions:
     
     Attributes:
         enabled: Whether compression is enabled
-        algorithm: Compression algorithm (currently only "7z" is supported)
-        level: Compression level 0-9 (9 = maximum compression)
+        algorithm: Compression algorithm, "7z" or "zstd"
+        level: Compression level, 0-9 for 7z or 1-22 for zstd
+        dictionary: Optional zstd dictionary (see ``train_dictionary``);
+            the same bytes are needed again to decompress
     """
     enabled: bool = True
-    algorithm: str = "7z"
+    algorithm: Literal["7z", "zstd"] = "7z"
     level: int = 9
+    dictionary: Optional[bytes] = None
     
     def __post_init__(self) -> None:
         """Validate options."""
+        if self.algorithm not in ARCHIVE_FORMATS:
+            raise CompressionError(f"Unsupported compression algorithm: {self.algorithm}")
+        if self.algorithm == "zstd":
+            if self.enabled and not _check_zstd_available():
+                raise CompressionError(
+                    "zstandard is required for zstd compression. "
+                    "Install with: pip install zstandard"
+                )
+            if not 1 <= self.level <= 22:
+                raise CompressionError(f"Compression level must be 1-22, got: {self.level}")
+            return
+        if self.dictionary is not None:
+            raise CompressionError("Dictionaries are only supported with zstd")
         if self.enabled and not _check_7z_available():
             raise CompressionError(
                 "py7zr is required for 7z compression. "
                 "Install with: pip install py7zr"
             )
-        if self.algorithm != "7z":
-            raise CompressionError(f"Unsupported compression algorithm: {self.algorithm}")
         if not 0 <= self.level <= 9:
             raise CompressionError(f"Compression level must be 0-9, got: {self.level}")
 
@@ -66,12 +125,12 @@ class CompressionResult:
     Result of a compression operation.
     
     Attributes:
-        archive_data: Compressed archive bytes
+        archive_data: Compressed archive bytes (None when written to a path)
         original_size: Total size of original files in bytes
         compressed_size: Size of compressed archive in bytes
         file_count: Number of files compressed
     """
-    archive_data: bytes
+    archive_data: Optional[bytes]
     original_size: int
     compressed_size: int
     file_count: int
@@ -106,7 +165,11 @@ def compress_files(
     options: CompressionOptions,
 ) -> CompressionResult:
     """
-    Compress files into a 7z archive.
+    Compress files into an archive (7z or zstd tar, per ``options``).
+    
+    Files are streamed into the archive from disk one at a time; the
+    archive itself is spooled to a temporary file once it grows past
+    ``SPOOL_MAX_BYTES``.
     
     Args:
         workspace: Workspace root directory
@@ -119,52 +182,210 @@ def compress_files(
     Raises:
         CompressionError: If compression fails
     """
+    _check_compress_args(file_paths, options)
+    
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        original_size = _write_archive(spool, workspace, file_paths, options)
+        spool.seek(0)
+        archive_data = spool.read()
+    
+    return CompressionResult(
+        archive_data=archive_data,
+        original_size=original_size,
+        compressed_size=len(archive_data),
+        file_count=len(file_paths),
+    )
+
+
+def compress_files_to_path(
+    workspace: Path,
+    file_paths: list[str],
+    options: CompressionOptions,
+    out_path: Path,
+) -> CompressionResult:
+    """
+    Compress files into an archive written directly to ``out_path``.
+    
+    Unlike ``compress_files``, the archive is never held in memory; the
+    returned result carries sizes only (``archive_data`` is None).
+    
+    Args:
+        workspace: Workspace root directory
+        file_paths: List of relative file paths to compress
+        options: Compression configuration
+        out_path: Destination path for the archive
+    
+    Returns:
+        CompressionResult with statistics
+    
+    Raises:
+        CompressionError: If compression fails
+    """
+    _check_compress_args(file_paths, options)
+    
+    original_size = _write_archive(out_path, workspace, file_paths, options)
+    
+    return CompressionResult(
+        archive_data=None,
+        original_size=original_size,
+        compressed_size=out_path.stat().st_size,
+        file_count=len(file_paths),
+    )
+
+
+def compress_files_to_stream(
+    workspace: Path,
+    file_paths: list[str],
+    options: CompressionOptions,
+    out_stream: BinaryIO,
+) -> CompressionResult:
+    """
+    Compress files into an archive written to a file-like object.
+    
+    ``out_stream`` must be writable and seekable (py7zr rewrites the start
+    header once the archive is complete), e.g. a SpooledTemporaryFile that
+    is later handed to a storage backend's ``put_blob_stream``. The stream
+    is left positioned at the end of the archive.
+    
+    Args:
+        workspace: Workspace root directory
+        file_paths: List of relative file paths to compress
+        options: Compression configuration
+        out_stream: Writable, seekable binary stream
+    
+    Returns:
+        CompressionResult with statistics (``archive_data`` is None)
+    
+    Raises:
+        CompressionError: If compression fails
+    """
+    _check_compress_args(file_paths, options)
+    
+    start = out_stream.tell()
+    original_size = _write_archive(out_stream, workspace, file_paths, options)
+    out_stream.seek(0, io.SEEK_END)
+    
+    return CompressionResult(
+        archive_data=None,
+        original_size=original_size,
+        compressed_size=out_stream.tell() - start,
+        file_count=len(file_paths),
+    )
+
+
+def _check_compress_args(file_paths: list[str], options: CompressionOptions) -> None:
     if not options.enabled:
         raise CompressionError("Compression is disabled")
     
     if not file_paths:
         raise CompressionError("No files to compress")
+
+
+def _write_archive(
+    target,
+    workspace: Path,
+    file_paths: list[str],
+    options: CompressionOptions,
+) -> int:
+    """Stream workspace files into an archive; returns total original size."""
+    if options.algorithm == "zstd":
+        if isinstance(target, (str, Path)):
+            with open(target, "wb") as out:
+                return _write_zstd_tar(out, workspace, file_paths, options)
+        return _write_zstd_tar(target, workspace, file_paths, options)
     
-    import py7zr
+    filters = _lzma2_filters(options.level, ARCHIVE_DICT_SIZE)
     
     original_size = 0
-    buffer = io.BytesIO()
-    
     try:
-        # Create 7z archive in memory
-        with py7zr.SevenZipFile(buffer, mode="w") as archive:
+        with _PY7ZR.SevenZipFile(target, mode="w", filters=filters) as archive:
             for rel_path in file_paths:
                 full_path = workspace / rel_path
                 if full_path.is_file():
-                    file_data = full_path.read_bytes()
-                    original_size += len(file_data)
+                    original_size += full_path.stat().st_size
                     # Add to archive maintaining relative path structure
-                    archive.writestr(file_data, rel_path)
+                    archive.write(full_path, arcname=rel_path)
     except Exception as exc:
         raise CompressionError(f"Failed to create archive: {exc}") from exc
+    return original_size
+
+
+def _write_zstd_tar(
+    out: BinaryIO,
+    workspace: Path,
+    file_paths: list[str],
+    options: CompressionOptions,
+) -> int:
+    """Stream workspace files into a zstd-compressed tar; returns original size."""
+    cctx = _ZSTD.ZstdCompressor(level=options.level, dict_data=_zstd_dict(options.dictionary))
     
-    archive_data = buffer.getvalue()
+    original_size = 0
+    try:
+        with cctx.stream_writer(out, closefd=False) as writer:
+            with tarfile.open(fileobj=writer, mode="w|") as tar:
+                for rel_path in file_paths:
+                    full_path = workspace / rel_path
+                    if full_path.is_file():
+                        original_size += full_path.stat().st_size
+                        tar.add(full_path, arcname=rel_path, recursive=False)
+    except Exception as exc:
+        raise CompressionError(f"Failed to create archive: {exc}") from exc
+    return original_size
+
+
+def _zstd_dict(dictionary: Optional[bytes]):
+    return _ZSTD.ZstdCompressionDict(dictionary) if dictionary else None
+
+
+def train_dictionary(sample_paths: Iterable[Path], size: int = DEFAULT_DICTIONARY_SIZE) -> bytes:
+    """
+    Train a zstd dictionary from representative files.
     
-    return CompressionResult(
-        archive_data=archive_data,
-        original_size=original_size,
-        compressed_size=len(archive_data),
-        file_count=len(file_paths),
-    )
+    Small capsule files (JSON, Markdown) compress far better against a
+    shared dictionary than on their own. Pass the result as
+    ``CompressionOptions.dictionary``.
+    
+    Args:
+        sample_paths: Files to train on
+        size: Maximum dictionary size in bytes
+    
+    Returns:
+        Dictionary bytes
+    
+    Raises:
+        CompressionError: If zstandard is unavailable or training fails
+    """
+    if not _check_zstd_available():
+        raise CompressionError(
+            "zstandard is required for dictionary training. "
+            "Install with: pip install zstandard"
+        )
+    samples = [Path(path).read_bytes() for path in sample_paths]
+    try:
+        return _ZSTD.train_dictionary(size, samples).as_bytes()
+    except _ZSTD.ZstdError as exc:
+        raise CompressionError(f"Failed to train dictionary: {exc}") from exc
 
 
 def decompress_archive(
     archive_data: bytes,
     target_dir: Path,
     expected_files: Optional[list[str]] = None,
+    algorithm: str = "7z",
+    dictionary: Optional[bytes] = None,
+    max_uncompressed_bytes: Optional[int] = MAX_UNCOMPRESSED_BYTES,
 ) -> list[str]:
     """
-    Decompress a 7z archive.
+    Decompress an archive.
     
     Args:
         archive_data: Compressed archive bytes
         target_dir: Directory to extract files to
         expected_files: Optional list of expected files for validation
+        algorithm: Algorithm the archive was built with ("7z" or "zstd")
+        dictionary: zstd dictionary used at compression time, if any
+        max_uncompressed_bytes: Refuse archives expanding beyond this size
+            (None disables the limit)
     
     Returns:
         List of extracted file paths (relative to target_dir)
@@ -172,22 +393,128 @@ def decompress_archive(
     Raises:
         CompressionError: If decompression fails or validation fails
     """
+    return decompress_archive_from_stream(
+        io.BytesIO(archive_data),
+        target_dir,
+        expected_files,
+        algorithm,
+        dictionary,
+        max_uncompressed_bytes,
+    )
+
+
+def decompress_archive_from_stream(
+    src_stream: BinaryIO,
+    target_dir: Path,
+    expected_files: Optional[list[str]] = None,
+    algorithm: str = "7z",
+    dictionary: Optional[bytes] = None,
+    max_uncompressed_bytes: Optional[int] = MAX_UNCOMPRESSED_BYTES,
+) -> list[str]:
+    """
+    Decompress an archive read from a file-like object.
+    
+    zstd tar archives are extracted in a single forward pass. 7z keeps its
+    header at the end of the archive, so py7zr needs random access;
+    non-seekable sources (HTTP or S3 response bodies) are first spooled to
+    a temporary file rather than read into memory.
+    
+    Member names are checked before anything is written: absolute paths,
+    ``..`` components and links are rejected, as are archives whose total
+    uncompressed size exceeds ``max_uncompressed_bytes``.
+    
+    Args:
+        src_stream: Readable binary stream positioned at the archive start
+        target_dir: Directory to extract files to
+        expected_files: Optional list of expected files for validation
+        algorithm: Algorithm the archive was built with ("7z" or "zstd")
+        dictionary: zstd dictionary used at compression time, if any
+        max_uncompressed_bytes: Refuse archives expanding beyond this size
+            (None disables the limit)
+    
+    Returns:
+        List of extracted file paths (relative to target_dir)
+    
+    Raises:
+        CompressionError: If decompression fails or validation fails
+    """
+    if algorithm == "zstd":
+        if not _check_zstd_available():
+            raise CompressionError(
+                "zstandard is required for zstd decompression. "
+                "Install with: pip install zstandard"
+            )
+        return _extract_zstd_tar(
+            src_stream, target_dir, expected_files, dictionary, max_uncompressed_bytes
+        )
+    if algorithm != "7z":
+        raise CompressionError(f"Unsupported compression algorithm: {algorithm}")
+    
     if not _check_7z_available():
         raise CompressionError(
             "py7zr is required for 7z decompression. "
             "Install with: pip install py7zr"
         )
     
-    import py7zr
+    if _is_seekable(src_stream):
+        return _extract_archive(src_stream, target_dir, expected_files, max_uncompressed_bytes)
     
-    buffer = io.BytesIO(archive_data)
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        shutil.copyfileobj(src_stream, spool)
+        spool.seek(0)
+        return _extract_archive(spool, target_dir, expected_files, max_uncompressed_bytes)
+
+
+def _is_seekable(stream: BinaryIO) -> bool:
+    seekable = getattr(stream, "seekable", None)
+    return bool(seekable and seekable())
+
+
+def _check_member_name(name: str) -> None:
+    """Reject archive member names that could land outside the target dir."""
+    rel = PurePosixPath(name.replace("\\", "/"))
+    if (
+        not rel.parts
+        or rel.is_absolute()
+        or ".." in rel.parts
+        or PureWindowsPath(name).drive
+    ):
+        raise CompressionError(f"Unsafe path in archive: {name!r}")
+
+
+def _check_total_size(total: int, limit: Optional[int]) -> None:
+    if limit is not None and total > limit:
+        raise CompressionError(
+            f"Archive expands beyond the {limit}-byte limit"
+        )
+
+
+def _extract_archive(
+    buffer: BinaryIO,
+    target_dir: Path,
+    expected_files: Optional[list[str]],
+    max_uncompressed_bytes: Optional[int],
+) -> list[str]:
     extracted_files: list[str] = []
     
     try:
-        with py7zr.SevenZipFile(buffer, mode="r") as archive:
+        with _PY7ZR.SevenZipFile(buffer, mode="r") as archive:
             # Get all file names
             names = archive.getnames()
             
+            # Vet every member from the header before writing anything.
+            # FileInfo.is_symlink needs py7zr >= 1.1.3 (the pyproject floor);
+            # the members of a solid 7z stream can only be decoded in order,
+            # so after vetting they are extracted in one pass.
+            total = 0
+            for info in archive.list():
+                _check_member_name(info.filename)
+                if info.is_symlink:
+                    raise CompressionError(f"Unsupported archive entry: {info.filename}")
+                if not info.is_directory:
+                    total += info.uncompressed
+            _check_total_size(total, max_uncompressed_bytes)
+            
             # Optional: validate file list
             if expected_files is not None:
                 expected_set = set(expected_files)
@@ -203,7 +530,7 @@ def decompress_archive(
             # Extract all files
             archive.extractall(path=target_dir)
             extracted_files = names
-    except py7zr.Bad7zFile as exc:
+    except _PY7ZR.Bad7zFile as exc:
         raise CompressionError(f"Invalid 7z archive: {exc}") from exc
     except Exception as exc:
         if isinstance(exc, CompressionError):
@@ -213,6 +540,52 @@ def decompress_archive(
     return extracted_files
 
 
+def _extract_zstd_tar(
+    src: BinaryIO,
+    target_dir: Path,
+    expected_files: Optional[list[str]],
+    dictionary: Optional[bytes],
+    max_uncompressed_bytes: Optional[int],
+) -> list[str]:
+    dctx = _ZSTD.ZstdDecompressor(dict_data=_zstd_dict(dictionary))
+    expected_set = set(expected_files) if expected_files is not None else None
+    root = target_dir.resolve()
+    names: list[str] = []
+    total = 0
+    
+    try:
+        with dctx.stream_reader(src, closefd=False) as reader:
+            with tarfile.open(fileobj=reader, mode="r|") as tar:
+                for member in tar:
+                    name = member.name
+                    if expected_set is not None and name not in expected_set:
+                        raise CompressionError(f"Archive contains unexpected member {name!r}")
+                    if not member.isfile():
+                        raise CompressionError(f"Unsupported archive entry: {name}")
+                    _check_member_name(name)
+                    dest = (root / name).resolve()
+                    if not dest.is_relative_to(root):
+                        raise CompressionError(f"Unsafe path in archive: {name!r}")
+                    total += member.size
+                    _check_total_size(total, max_uncompressed_bytes)
+                    dest.parent.mkdir(parents=True, exist_ok=True)
+                    with tar.extractfile(member) as data, open(dest, "wb") as out:
+                        shutil.copyfileobj(data, out)
+                    names.append(name)
+    except CompressionError:
+        raise
+    except (tarfile.TarError, _ZSTD.ZstdError) as exc:
+        raise CompressionError(f"Invalid zstd archive: {exc}") from exc
+    except Exception as exc:
+        raise CompressionError(f"Failed to extract archive: {exc}") from exc
+    
+    if expected_set is not None:
+        missing = expected_set - set(names)
+        if missing:
+            raise CompressionError(f"Archive is missing expected members: {sorted(missing)}")
+    return names
+
+
 def estimate_compression_ratio(sample_data: bytes) -> float:
     """
     Estimate compression ratio based on a sample.
@@ -231,21 +604,49 @@ def estimate_compression_ratio(sample_data: bytes) -> float:
     if len(sample_data) < 1024:
         return 0.5  # Default estimate for small files
     
-    import py7zr
+    # Near-random bytes won't shrink; skip the 7z round-trip entirely
+    if _byte_entropy(sample_data[:_ENTROPY_PROBE_BYTES]) > INCOMPRESSIBLE_ENTROPY_THRESHOLD:
+        return _INCOMPRESSIBLE_RATIO
     
     # Use a sample of up to 64KB for estimation
     sample_size = min(len(sample_data), 65536)
     sample = sample_data[:sample_size]
     
+    key = hashlib.blake2b(sample, digest_size=16).digest()
+    with _ratio_cache_lock:
+        cached = _ratio_cache.get(key)
+    if cached is not None:
+        return cached
+    
     try:
         buffer = io.BytesIO()
-        with py7zr.SevenZipFile(buffer, mode="w") as archive:
+        filters = _lzma2_filters(9, _SAMPLE_DICT_SIZE)
+        with _PY7ZR.SevenZipFile(buffer, mode="w", filters=filters) as archive:
             archive.writestr(sample, "sample")
         
         compressed = len(buffer.getvalue())
-        return compressed / sample_size if sample_size > 0 else 1.0
+        ratio = compressed / sample_size if sample_size > 0 else 1.0
     except Exception:  # noqa: BLE001
         return 0.5  # Default estimate on error
+    
+    # Compression runs unlocked; only the lookup/evict/insert is serialized so
+    # parallel exports don't race on the shared dict.
+    with _ratio_cache_lock:
+        if key not in _ratio_cache and len(_ratio_cache) >= _RATIO_CACHE_MAX:
+            del _ratio_cache[next(iter(_ratio_cache))]
+        _ratio_cache[key] = ratio
+    return ratio
+
+
+def _byte_entropy(data: bytes) -> float:
+    """Shannon entropy of ``data`` in bits per byte (0.0-8.0)."""
+    total = len(data)
+    if not total:
+        return 0.0
+    return -sum(
+        (count / total) * math.log2(count / total)
+        for count in Counter(data).values()
+    )
 
 
 def get_compression_info() -> dict:
@@ -258,10 +659,12 @@ def get_compression_info() -> dict:
     info = {
         "available": _check_7z_available(),
         "algorithm": "7z",
+        "zstd_available": _check_zstd_available(),
     }
     
     if info["available"]:
-        import py7zr
-        info["py7zr_version"] = py7zr.__version__
+        info["py7zr_version"] = _PY7ZR.__version__
+    if info["zstd_available"]:
+        info["zstandard_version"] = _ZSTD.__version__
     
     return info
@@ -1,10 +1,37 @@
 from __future__ import annotations
 
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
+from typing import Iterator
 
 from namnesis.spec.schemas import SCHEMA_NAMES, SchemaRegistry, SchemaValidationError, load_json
 
+# Below this many files, process start-up costs more than parallel validation saves
+PARALLEL_MIN_FILES = 32
+
+
+def _iter_example_files(root: str) -> Iterator[str]:
+    """Yield paths below ``root`` whose file name has a registered schema."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_example_files(entry.path)
+            elif entry.name in SCHEMA_NAMES:
+                yield entry.path
+
+
+def _validate_file(path: str, registry: SchemaRegistry) -> list[str]:
+    """Return failure lines for one example file (empty when it is valid)."""
+    payload = load_json(Path(path))
+    try:
+        registry.validate_instance(payload, SCHEMA_NAMES[os.path.basename(path)])
+    except SchemaValidationError as exc:
+        return [f"{path}: {exc}", *(f"  - {err}" for err in exc.errors)]
+    return []
+
 
 def main() -> int:
     registry = SchemaRegistry.default()
@@ -14,21 +41,16 @@ def main() -> int:
         print(f"Examples directory not found: {examples_root}")
         return 1
 
-    failures: list[str] = []
-    validated = 0
-
-    for path in sorted(examples_root.rglob("*.json")):
-        schema_name = SCHEMA_NAMES.get(path.name)
-        if not schema_name:
-            continue
-        payload = load_json(path)
-        try:
-            registry.validate_instance(payload, schema_name)
-        except SchemaValidationError as exc:
-            failures.append(f"{path}: {exc}")
-            failures.extend(f"  - {err}" for err in exc.errors)
-        else:
-            validated += 1
+    paths = sorted(_iter_example_files(str(examples_root)))
+
+    if len(paths) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(_validate_file, paths, repeat(registry), chunksize=8))
+    else:
+        results = [_validate_file(path, registry) for path in paths]
+
+    failures = [line for lines in results for line in lines]
+    validated = sum(1 for lines in results if not lines)
 
     if failures:
         print("Schema validation failures:")
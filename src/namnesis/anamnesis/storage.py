@@ -2,22 +2,51 @@ from __future__ import annotations
 
 import json
 import os
+import shutil
+import tempfile
+import threading
 import time
 from base64 import urlsafe_b64encode
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Protocol
+from typing import Any, BinaryIO, Callable, ClassVar, Iterator, Optional, Protocol, Sequence, TypeVar, Union
 
 import httpx
 
+from ..utils import json_dumps_bytes, json_loads
+
+
+# Downloads up to this size stay in RAM; larger ones spill to disk.
+_SPOOL_MAX_BYTES = 8 << 20
+_STREAM_CHUNK_SIZE = 1 << 16
+# Buffer for stream-to-file copies; far fewer syscalls than the 64 KiB default
+_COPY_BUFSIZE = 1 << 20
+# Upper bound on concurrent requests issued by the *_blobs_batch methods
+BATCH_MAX_WORKERS = 16
+HTTP_POOL_SIZE = 32
+# Capsules whose read URLs are kept in memory per presigned backend
+URL_CACHE_MAX_ENTRIES = 1024
+
+_T = TypeVar("_T")
+_B = TypeVar("_B", bound="_PresignedBackendBase")
+
 
 class StorageBackend(Protocol):
     def put_blob(self, capsule_id: str, blob_id: str, data: bytes) -> str:
         ...
 
+    def put_blob_stream(self, capsule_id: str, blob_id: str, stream: BinaryIO) -> str:
+        ...
+
     def get_blob(self, ref: str) -> bytes:
         ...
 
+    def get_blob_stream(self, ref: str) -> BinaryIO:
+        ...
+
     def has_blob(self, ref: str) -> bool:
         ...
 
@@ -31,30 +60,89 @@ class StorageBackend(Protocol):
         ...
 
 
+def put_blobs(backend: StorageBackend, capsule_id: str, items: Sequence[tuple[str, bytes]]) -> list[str]:
+    """Upload ``(blob_id, data)`` pairs, returning refs in input order.
+
+    Uses the backend's ``put_blobs_batch`` when available (remote backends
+    fan requests out over a thread pool) and falls back to serial puts.
+    """
+    batch = getattr(backend, "put_blobs_batch", None)
+    if batch is not None:
+        return batch(capsule_id, items)
+    return [backend.put_blob(capsule_id, bid, data) for bid, data in items]
+
+
+def get_blobs(backend: StorageBackend, refs: Sequence[str]) -> list[bytes]:
+    """Download blobs by ref, returning payloads in input order."""
+    batch = getattr(backend, "get_blobs_batch", None)
+    if batch is not None:
+        return batch(refs)
+    return [backend.get_blob(ref) for ref in refs]
+
+
+@contextmanager
+def write_session(backend: StorageBackend, capsule_id: str, blob_ids: Sequence[str]) -> Iterator[Any]:
+    """Group the writes of one capsule, presigning them together where supported.
+
+    Backends without a ``write_session`` method are yielded unchanged.
+    """
+    opener = getattr(backend, "write_session", None)
+    if opener is None:
+        yield backend
+        return
+    with opener(capsule_id, blob_ids) as session:
+        yield session
+
+
+def _run_batch(fn: Callable[..., _T], calls: Sequence[tuple], max_workers: int = BATCH_MAX_WORKERS) -> list[_T]:
+    """Run ``fn(*args)`` for each args tuple concurrently, preserving order."""
+    if len(calls) <= 1:
+        return [fn(*args) for args in calls]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+        return list(executor.map(lambda args: fn(*args), calls))
+
+
+def _iter_files(top: str) -> Iterator[str]:
+    """Yield paths of regular files below ``top`` (no symlink following).
+
+    Walks with os.scandir so file-type checks come from the directory entry
+    rather than a stat() per path.
+    """
+    with os.scandir(top) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry.path
+
+
 @dataclass(frozen=True)
 class LocalDirBackend:
     root: Path
+    # root.resolve(), computed once for the path-traversal checks
+    _resolved_root: Path = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_resolved_root", self.root.resolve())
 
     def capsule_root(self, capsule_id: str) -> Path:
         return self.root / "capsules" / capsule_id
 
     def put_blob(self, capsule_id: str, blob_id: str, data: bytes) -> str:
-        blobs_dir = self.capsule_root(capsule_id) / "blobs"
-        blobs_dir.mkdir(parents=True, exist_ok=True)
-        target = blobs_dir / blob_id
-        self._atomic_write(target, data)
-        rel = Path("capsules") / capsule_id / "blobs" / blob_id
-        return rel.as_posix()
+        return self._put_blob(capsule_id, blob_id, data)
+
+    def put_blob_stream(self, capsule_id: str, blob_id: str, stream: BinaryIO) -> str:
+        return self._put_blob(capsule_id, blob_id, stream)
 
     def get_blob(self, ref: str) -> bytes:
-        path = (self.root / ref).resolve()
-        if not path.is_relative_to(self.root.resolve()):
-            raise ValueError(f"Path traversal detected: {ref}")
-        return path.read_bytes()
+        return self._blob_path(ref).read_bytes()
+
+    def get_blob_stream(self, ref: str) -> BinaryIO:
+        return self._blob_path(ref).open("rb")
 
     def has_blob(self, ref: str) -> bool:
         path = (self.root / ref).resolve()
-        if not path.is_relative_to(self.root.resolve()):
+        if not path.is_relative_to(self._resolved_root):
             return False
         return path.is_file()
 
@@ -65,26 +153,45 @@ class LocalDirBackend:
 
     def get_document(self, capsule_id: str, path: str) -> bytes:
         target = (self.capsule_root(capsule_id) / path).resolve()
-        if not target.is_relative_to(self.root.resolve()):
+        if not target.is_relative_to(self._resolved_root):
             raise ValueError(f"Path traversal detected: {path}")
         return target.read_bytes()
 
     def list(self, capsule_id: str, prefix: str) -> list[str]:
-        base = self.capsule_root(capsule_id)
-        root = base / prefix
-        if not root.exists():
+        base = str(self.capsule_root(capsule_id))
+        strip = len(base) + len(os.sep)
+        try:
+            paths = [
+                path[strip:].replace(os.sep, "/")
+                for path in _iter_files(os.path.join(base, prefix))
+            ]
+        except (FileNotFoundError, NotADirectoryError):
             return []
-        paths = []
-        for item in root.rglob("*"):
-            if item.is_file():
-                paths.append(item.relative_to(base).as_posix())
-        return sorted(paths)
+        paths.sort()
+        return paths
 
-    def _atomic_write(self, path: Path, data: bytes) -> None:
+    def _put_blob(self, capsule_id: str, blob_id: str, data: Union[bytes, BinaryIO]) -> str:
+        blobs_dir = self.capsule_root(capsule_id) / "blobs"
+        blobs_dir.mkdir(parents=True, exist_ok=True)
+        target = blobs_dir / blob_id
+        self._atomic_write(target, data)
+        rel = Path("capsules") / capsule_id / "blobs" / blob_id
+        return rel.as_posix()
+
+    def _blob_path(self, ref: str) -> Path:
+        path = (self.root / ref).resolve()
+        if not path.is_relative_to(self._resolved_root):
+            raise ValueError(f"Path traversal detected: {ref}")
+        return path
+
+    def _atomic_write(self, path: Path, data: Union[bytes, BinaryIO]) -> None:
         tmp = path.with_suffix(path.suffix + ".tmp")
         try:
             with tmp.open("wb") as handle:
-                handle.write(data)
+                if isinstance(data, (bytes, bytearray, memoryview)):
+                    handle.write(data)
+                else:
+                    _copy_stream(data, handle)
                 handle.flush()
                 os.fsync(handle.fileno())
             tmp.replace(path)
@@ -104,10 +211,27 @@ class S3Backend:
     session_token: str | None = None
     read_after_write_retries: int = 3
     read_after_write_delay: float = 0.5
+    max_pool_connections: int = 32
+
+    # Lazily-built boto3 client shared by all operations on this backend
+    _cached_client: Any = field(default=None, init=False, repr=False, compare=False)
+    _client_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
 
     def _client(self):
+        client = self._cached_client
+        if client is not None:
+            return client
+        with self._client_lock:
+            if self._cached_client is None:
+                object.__setattr__(self, "_cached_client", self._build_client())
+            return self._cached_client
+
+    def _build_client(self):
         try:
             import boto3
+            from botocore.config import Config
         except ImportError as exc:
             raise RuntimeError("boto3 is required for S3Backend.") from exc
 
@@ -118,6 +242,10 @@ class S3Backend:
             aws_access_key_id=self.access_key_id,
             aws_secret_access_key=self.secret_access_key,
             aws_session_token=self.session_token,
+            config=Config(
+                max_pool_connections=self.max_pool_connections,
+                retries={"mode": "standard"},
+            ),
         )
 
     def _key(self, capsule_id: str, path: str) -> str:
@@ -134,12 +262,30 @@ class S3Backend:
         self._ensure_read_after_write(client, key)
         return key
 
+    def put_blob_stream(self, capsule_id: str, blob_id: str, stream: BinaryIO) -> str:
+        key = self._key(capsule_id, f"blobs/{blob_id}")
+        client = self._client()
+        client.upload_fileobj(Fileobj=stream, Bucket=self.bucket, Key=key)
+        self._ensure_read_after_write(client, key)
+        return key
+
     def get_blob(self, ref: str) -> bytes:
         client = self._client()
         response = client.get_object(Bucket=self.bucket, Key=ref)
         with response["Body"] as body:
             return body.read()
 
+    def get_blob_stream(self, ref: str) -> BinaryIO:
+        client = self._client()
+        response = client.get_object(Bucket=self.bucket, Key=ref)
+        return response["Body"]
+
+    def put_blobs_batch(self, capsule_id: str, items: Sequence[tuple[str, bytes]]) -> list[str]:
+        return _run_batch(self.put_blob, [(capsule_id, bid, data) for bid, data in items])
+
+    def get_blobs_batch(self, refs: Sequence[str]) -> list[bytes]:
+        return _run_batch(self.get_blob, [(ref,) for ref in refs])
+
     def has_blob(self, ref: str) -> bool:
         try:
             from botocore.exceptions import ClientError
@@ -198,122 +344,333 @@ def _base64url_encode(data: bytes) -> str:
     return urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
 
 
+def _copy_stream(src: BinaryIO, handle: BinaryIO) -> None:
+    """Copy the rest of ``src`` into the open file ``handle``.
+
+    Streams backed by a real file (including a rolled-over spool) are moved
+    with os.sendfile (kernel-side, no Python buffers) where available;
+    anything else, or a sendfile failure, falls back to a buffered copy
+    from the current position.
+    """
+    src_fd = _file_descriptor(src) if hasattr(os, "sendfile") else None
+    if src_fd is not None:
+        offset = src.tell()
+        try:
+            end = os.fstat(src_fd).st_size
+            while offset < end:
+                sent = os.sendfile(handle.fileno(), src_fd, offset, end - offset)
+                if not sent:
+                    break
+                offset += sent
+        except OSError:
+            pass  # e.g. filesystem without sendfile support
+        src.seek(offset)
+    shutil.copyfileobj(src, handle, _COPY_BUFSIZE)
+
+
+def _file_descriptor(stream: BinaryIO) -> Optional[int]:
+    """OS-level descriptor behind ``stream`` with pending writes flushed, or None."""
+    if isinstance(stream, tempfile.SpooledTemporaryFile) and not stream._rolled:
+        return None  # still in memory; fileno() would force it to disk
+    try:
+        stream.flush()
+        return stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        # io.UnsupportedOperation (BytesIO, HTTP bodies) is an OSError
+        return None
+
+
+def _iter_stream(stream: BinaryIO) -> Iterator[bytes]:
+    """Yield fixed-size chunks from a binary stream until EOF."""
+    while chunk := stream.read(_STREAM_CHUNK_SIZE):
+        yield chunk
+
+
+def _stream_length(stream: BinaryIO) -> int:
+    """Remaining bytes in a seekable stream (position is left unchanged)."""
+    start = stream.tell()
+    end = stream.seek(0, os.SEEK_END)
+    stream.seek(start)
+    return end - start
+
+
+def _pooled_http_client() -> httpx.Client:
+    """HTTP client with a keep-alive pool sized for concurrent blob transfers."""
+    limits = httpx.Limits(
+        max_connections=HTTP_POOL_SIZE,
+        max_keepalive_connections=HTTP_POOL_SIZE,
+    )
+    return httpx.Client(
+        timeout=60,
+        transport=httpx.HTTPTransport(limits=limits, retries=3),
+    )
+
+
+def _put_stream(
+    client: httpx.Client,
+    url: str,
+    stream: BinaryIO,
+    headers: Optional[dict[str, str]] = None,
+) -> httpx.Response:
+    """PUT a seekable stream with an explicit Content-Length.
+
+    Presigned S3/R2 PUTs reject chunked transfer encoding, so the length is
+    taken from the stream up front and the body is sent chunk by chunk.
+    """
+    request_headers = {"Content-Length": str(_stream_length(stream))}
+    if headers:
+        request_headers.update(headers)
+    return client.put(url, content=_iter_stream(stream), headers=request_headers)
+
+
+def _download_to_spool(client: httpx.Client, url: str) -> BinaryIO:
+    """GET a URL into a spooled temp file positioned at the start."""
+    spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES)
+    try:
+        with client.stream("GET", url) as resp:
+            resp.raise_for_status()
+            for chunk in resp.iter_bytes(_STREAM_CHUNK_SIZE):
+                spool.write(chunk)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
 # ============ Presigned URL Backend ============
 
 
 @dataclass
-class PresignedUrlBackend:
+class _ReadUrlCache:
     """
-    Remote storage backend using Presigned URLs via credential service.
+    Bounded LRU of presigned URL maps with per-key request coalescing.
 
-    Uses ECDSA/secp256k1 (EIP-191 personal_sign) for Relay authentication.
+    The first caller to miss on a key fetches; concurrent callers for the
+    same key wait for it and then re-read the cache instead of issuing
+    their own credential-service request.
+    """
 
-    Workflow:
-    1. Client signs request with ECDSA wallet key
-    2. Credential service recovers signer, verifies NFT ownership on-chain
-    3. Credential service returns Presigned URLs
-    4. Client uses URLs to directly access R2/S3
+    max_entries: int = URL_CACHE_MAX_ENTRIES
+    _entries: OrderedDict[str, tuple[dict, float]] = field(default_factory=OrderedDict)
+    _inflight: dict[str, threading.Event] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
 
-    Attributes:
-        credential_service_url: URL of the credential service
-        private_key_hex: 0x-prefixed ECDSA private key for signing requests
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], tuple[dict, float]],
+        buffer_seconds: float,
+    ) -> dict:
+        while True:
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None and time.time() < cached[1] - buffer_seconds:
+                    self._entries.move_to_end(key)
+                    return cached[0]
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = self._inflight[key] = threading.Event()
+            if not leader:
+                # Re-check once the leader finishes; if it failed, retry as leader
+                event.wait()
+                continue
+            try:
+                urls, expires_at = fetch()
+                with self._lock:
+                    self._entries[key] = (urls, expires_at)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                return urls
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+                event.set()
+
+
+@dataclass(kw_only=True)
+class _PresignedBackendBase:
+    """
+    Shared plumbing for backends that read and write through presigned URLs.
+
+    Owns the pooled HTTP client, the read-URL cache and every blob/document
+    transfer. Subclasses supply the signing key and the authenticated
+    presign request.
     """
 
-    credential_service_url: str
-    private_key_hex: str
-    
     # Internal URL cache (in-memory)
-    _url_cache: dict[str, tuple[dict, float]] = field(
-        default_factory=dict, repr=False, compare=False
+    _url_cache: _ReadUrlCache = field(
+        default_factory=_ReadUrlCache, repr=False, compare=False
     )
     _cache_buffer_seconds: float = 300  # Refresh 5 minutes before expiration
-    
-    def _get_presigned_urls(
+
+    # Keep-alive pool shared by presign requests and blob/document transfers,
+    # opened on first use and released by close()
+    _http_client: Optional[httpx.Client] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _http_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    # Parsed signing account, loaded once and shared by all presign requests
+    _account: Any = field(default=None, init=False, repr=False, compare=False)
+    _account_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    # Extra headers on blob PUTs; None sends none
+    _blob_put_headers: ClassVar[Optional[dict[str, str]]] = None
+
+    @property
+    def _http(self) -> httpx.Client:
+        client = self._http_client
+        if client is not None:
+            return client
+        with self._http_lock:
+            if self._http_client is None:
+                self._http_client = _pooled_http_client()
+            return self._http_client
+
+    def close(self) -> None:
+        """Close pooled HTTP connections; the backend reopens them if used again."""
+        with self._http_lock:
+            client, self._http_client = self._http_client, None
+        if client is not None:
+            client.close()
+
+    def __enter__(self: _B) -> _B:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _signing_key(self) -> Optional[str]:
+        raise NotImplementedError
+
+    def _signer(self):
+        account = self._account
+        if account is not None:
+            return account
+        with self._account_lock:
+            if self._account is None:
+                from ..sigil.eth import get_account
+
+                self._account = get_account(self._signing_key())
+            return self._account
+
+    def _request_presigned_urls(
         self,
         capsule_id: str,
         action: str,
         blobs: Optional[list[str]] = None,
     ) -> dict:
-        """
-        Get presigned URLs with caching.
-        
-        Note: Write requests typically aren't cached since blob lists may change.
-        """
-        # For read, try cache first
-        if action == "read":
-            cache_key = f"{capsule_id}:read"
-            if cache_key in self._url_cache:
-                urls, expires_at = self._url_cache[cache_key]
-                if time.time() < expires_at - self._cache_buffer_seconds:
-                    return urls
-        
-        # Request new presigned URLs
-        result = self._request_presigned_urls(capsule_id, action, blobs)
-        
-        # Cache read URLs
-        if action == "read":
-            cache_key = f"{capsule_id}:read"
-            self._url_cache[cache_key] = (result["urls"], result["expires_at"])
+        raise NotImplementedError
+
+    def _post_presign(self, payload: dict) -> dict:
+        resp = self._http.post(
+            f"{self.credential_service_url}/presign",
+            content=json_dumps_bytes(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=30,
+        )
         
-        return result["urls"]
+        if resp.status_code != 200:
+            raise RuntimeError(
+                f"Credential service error: {resp.status_code} - {resp.text}"
+            )
+        return json_loads(resp.content)
     
-    def _request_presigned_urls(
+    def _get_presigned_urls(
         self,
         capsule_id: str,
         action: str,
         blobs: Optional[list[str]] = None,
     ) -> dict:
-        """Request presigned URLs from credential service using ECDSA."""
-        from ..sigil.eth import sign_message, get_address
-
-        timestamp = int(time.time())
-        message = f"{capsule_id}:{action}:{timestamp}"
-
-        raw_sig = sign_message(message, self.private_key_hex)
-        # Ensure 0x prefix for viem compatibility on the Worker side
-        signature = raw_sig if raw_sig.startswith("0x") else f"0x{raw_sig}"
-        address = get_address(self.private_key_hex)
-
-        payload = {
-            "capsule_id": capsule_id,
-            "action": action,
-            "timestamp": timestamp,
-            "signature": signature,
-            "address": address,
-        }
-        if blobs:
-            payload["blobs"] = blobs
+        """
+        Get presigned URLs with caching.
         
-        with httpx.Client(timeout=30) as client:
-            resp = client.post(
-                f"{self.credential_service_url}/presign",
-                json=payload,
-            )
+        Note: Write requests typically aren't cached since blob lists may change.
+        """
+        if action != "read":
+            return self._request_presigned_urls(capsule_id, action, blobs)["urls"]
         
-        if resp.status_code != 200:
-            raise RuntimeError(
-                f"Credential service error: {resp.status_code} - {resp.text}"
-            )
-        return resp.json()
+        # Read URLs are cached; concurrent misses share a single request
+        def fetch() -> tuple[dict, float]:
+            result = self._request_presigned_urls(capsule_id, action, blobs)
+            return result["urls"], result["expires_at"]
+        
+        return self._url_cache.get_or_fetch(
+            f"{capsule_id}:read", fetch, self._cache_buffer_seconds
+        )
     
     # ============ StorageBackend Protocol Implementation ============
     
     def put_blob(self, capsule_id: str, blob_id: str, data: bytes) -> str:
         """Upload blob to R2 using presigned URL."""
         urls = self._get_presigned_urls(capsule_id, "write", blobs=[blob_id])
+        return self._upload_blob(urls, capsule_id, blob_id, data)
+    
+    def put_blob_stream(self, capsule_id: str, blob_id: str, stream: BinaryIO) -> str:
+        """Upload blob from a seekable stream using presigned URL."""
+        urls = self._get_presigned_urls(capsule_id, "write", blobs=[blob_id])
+        return self._upload_blob(urls, capsule_id, blob_id, stream)
+    
+    def _upload_blob(
+        self, urls: dict, capsule_id: str, blob_id: str, data: Union[bytes, BinaryIO]
+    ) -> str:
         url = urls.get("blobs", {}).get(blob_id)
         if not url:
             raise RuntimeError(f"No presigned URL for blob: {blob_id}")
         
-        with httpx.Client(timeout=60) as client:
-            resp = client.put(url, content=data, headers={"Content-Type": "application/octet-stream"})
+        headers = self._blob_put_headers
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            resp = self._http.put(url, content=data, headers=headers)
+        else:
+            resp = _put_stream(self._http, url, data, headers=headers)
         if resp.status_code not in (200, 201):
-            raise RuntimeError(f"Upload failed: {resp.status_code}")
+            raise RuntimeError(f"Upload failed: {resp.status_code} - {resp.text!r}")
         
         return f"capsules/{capsule_id}/blobs/{blob_id}"
     
+    @contextmanager
+    def write_session(
+        self, capsule_id: str, blob_ids: Sequence[str]
+    ) -> Iterator[PresignedWriteSession]:
+        """Presign every blob and document URL of a capsule write at once."""
+        urls = self._get_presigned_urls(capsule_id, "write", blobs=list(blob_ids))
+        yield PresignedWriteSession(self, capsule_id, urls)
+    
     def get_blob(self, ref: str) -> bytes:
         """Download blob from R2 using presigned URL."""
+        url = self._blob_read_url(ref)
+        resp = self._http.get(url)
+        resp.raise_for_status()
+        return resp.content
+    
+    def get_blob_stream(self, ref: str) -> BinaryIO:
+        """Download blob from R2 into a spooled temp file."""
+        return _download_to_spool(self._http, self._blob_read_url(ref))
+    
+    def put_blobs_batch(self, capsule_id: str, items: Sequence[tuple[str, bytes]]) -> list[str]:
+        """Upload many blobs with one presign request and concurrent PUTs."""
+        urls = self._get_presigned_urls(capsule_id, "write", blobs=[bid for bid, _ in items])
+        return _run_batch(self._upload_blob, [(urls, capsule_id, bid, data) for bid, data in items])
+    
+    def get_blobs_batch(self, refs: Sequence[str]) -> list[bytes]:
+        """Download many blobs concurrently over the pooled client."""
+        urls = [self._blob_read_url(ref) for ref in refs]
+        
+        def download(url: str) -> bytes:
+            resp = self._http.get(url)
+            resp.raise_for_status()
+            return resp.content
+        
+        return _run_batch(download, [(url,) for url in urls])
+    
+    def _blob_read_url(self, ref: str) -> str:
         # ref format: capsules/{owner_fp}/{uuid}/blobs/{blob_id}
         parts = ref.split("/")
         if len(parts) < 5:
@@ -326,11 +683,7 @@ class PresignedUrlBackend:
         url = urls.get("blobs", {}).get(blob_id)
         if not url:
             raise RuntimeError(f"No presigned URL for blob: {blob_id}")
-        
-        with httpx.Client(timeout=60) as client:
-            resp = client.get(url)
-        resp.raise_for_status()
-        return resp.content
+        return url
     
     def has_blob(self, ref: str) -> bool:
         """Check if blob exists."""
@@ -349,39 +702,18 @@ class PresignedUrlBackend:
     def put_document(self, capsule_id: str, path: str, data: bytes) -> None:
         """Upload document (manifest/report) using presigned URL."""
         urls = self._get_presigned_urls(capsule_id, "write", blobs=[])
-        
-        # Map path to URL key
-        if path in ("manifest.json", "capsule.manifest.json"):
-            url = urls.get("manifest")
-        elif path == "redaction.report.json":
-            url = urls.get("redaction_report")
-        else:
-            raise RuntimeError(f"Unknown document path: {path}")
-        
-        if not url:
-            raise RuntimeError(f"No presigned URL for document: {path}")
-        
-        with httpx.Client(timeout=60) as client:
-            resp = client.put(url, content=data, headers={"Content-Type": "application/json"})
+        self._upload_document(urls, path, data)
+    
+    def _upload_document(self, urls: dict, path: str, data: bytes) -> None:
+        url = _document_url(urls, path)
+        resp = self._http.put(url, content=data, headers={"Content-Type": "application/json"})
         if resp.status_code not in (200, 201):
             raise RuntimeError(f"Upload failed: {resp.status_code}")
     
     def get_document(self, capsule_id: str, path: str) -> bytes:
         """Download document using presigned URL."""
-        urls = self._get_presigned_urls(capsule_id, "read")
-        
-        if path in ("manifest.json", "capsule.manifest.json"):
-            url = urls.get("manifest")
-        elif path == "redaction.report.json":
-            url = urls.get("redaction_report")
-        else:
-            raise RuntimeError(f"Unknown document path: {path}")
-        
-        if not url:
-            raise RuntimeError(f"No presigned URL for document: {path}")
-        
-        with httpx.Client(timeout=60) as client:
-            resp = client.get(url)
+        url = _document_url(self._get_presigned_urls(capsule_id, "read"), path)
+        resp = self._http.get(url)
         resp.raise_for_status()
         return resp.content
     
@@ -399,11 +731,84 @@ class PresignedUrlBackend:
         return []
 
 
+def _document_url(urls: dict, path: str) -> str:
+    """Pick the presigned URL for a capsule document (manifest/report)."""
+    # Map path to URL key
+    if path in ("manifest.json", "capsule.manifest.json"):
+        url = urls.get("manifest")
+    elif path == "redaction.report.json":
+        url = urls.get("redaction_report")
+    else:
+        raise RuntimeError(f"Unknown document path: {path}")
+    
+    if not url:
+        raise RuntimeError(f"No presigned URL for document: {path}")
+    return url
+
+
+@dataclass
+class PresignedUrlBackend(_PresignedBackendBase):
+    """
+    Remote storage backend using Presigned URLs via credential service.
+
+    Uses ECDSA/secp256k1 (EIP-191 personal_sign) for Relay authentication.
+
+    Workflow:
+    1. Client signs request with ECDSA wallet key
+    2. Credential service recovers signer, verifies NFT ownership on-chain
+    3. Credential service returns Presigned URLs
+    4. Client uses URLs to directly access R2/S3
+
+    Attributes:
+        credential_service_url: URL of the credential service
+        private_key_hex: 0x-prefixed ECDSA private key for signing requests
+    """
+
+    credential_service_url: str
+    private_key_hex: str
+
+    _blob_put_headers: ClassVar[Optional[dict[str, str]]] = {
+        "Content-Type": "application/octet-stream"
+    }
+
+    def _signing_key(self) -> Optional[str]:
+        return self.private_key_hex
+    
+    def _request_presigned_urls(
+        self,
+        capsule_id: str,
+        action: str,
+        blobs: Optional[list[str]] = None,
+    ) -> dict:
+        """Request presigned URLs from credential service using ECDSA."""
+        from ..sigil.eth import sign_message_with
+
+        timestamp = int(time.time())
+        message = f"{capsule_id}:{action}:{timestamp}"
+
+        account = self._signer()
+        raw_sig = sign_message_with(account, message)
+        # Ensure 0x prefix for viem compatibility on the Worker side
+        signature = raw_sig if raw_sig.startswith("0x") else f"0x{raw_sig}"
+        address = account.address
+
+        payload = {
+            "capsule_id": capsule_id,
+            "action": action,
+            "timestamp": timestamp,
+            "signature": signature,
+            "address": address,
+        }
+        if blobs:
+            payload["blobs"] = blobs
+        return self._post_presign(payload)
+
+
 # ============ ECDSA Presigned URL Backend (New) ============
 
 
 @dataclass
-class EcdsaPresignedUrlBackend:
+class EcdsaPresignedUrlBackend(_PresignedBackendBase):
     """
     Remote storage backend using ECDSA-signed Presigned URLs.
     
@@ -425,34 +830,12 @@ class EcdsaPresignedUrlBackend:
     credential_service_url: str
     soul_id: int
     private_key: Optional[str] = None
-    
-    # Internal URL cache (in-memory)
-    _url_cache: dict[str, tuple[dict, float]] = field(
-        default_factory=dict, repr=False, compare=False
-    )
-    _cache_buffer_seconds: float = 300
-    
-    def _get_presigned_urls(
-        self,
-        capsule_id: str,
-        action: str,
-        blobs: Optional[list[str]] = None,
-    ) -> dict:
-        """Get presigned URLs with caching."""
-        if action == "read":
-            cache_key = f"{capsule_id}:read"
-            if cache_key in self._url_cache:
-                urls, expires_at = self._url_cache[cache_key]
-                if time.time() < expires_at - self._cache_buffer_seconds:
-                    return urls
-        
-        result = self._request_presigned_urls(capsule_id, action, blobs)
-        
-        if action == "read":
-            cache_key = f"{capsule_id}:read"
-            self._url_cache[cache_key] = (result["urls"], result["expires_at"])
-        
-        return result["urls"]
+
+    # 不加 Content-Type：R2 presigned PUT 未签该 header，带会 400
+    _blob_put_headers: ClassVar[Optional[dict[str, str]]] = None
+
+    def _signing_key(self) -> Optional[str]:
+        return self.private_key
     
     def _request_presigned_urls(
         self,
@@ -461,11 +844,11 @@ class EcdsaPresignedUrlBackend:
         blobs: Optional[list[str]] = None,
     ) -> dict:
         """Request presigned URLs using ECDSA authentication."""
-        from ..sigil.eth import sign_message
+        from ..sigil.eth import sign_message_with
         
         timestamp = int(time.time())
         message = f"{capsule_id}:{action}:{self.soul_id}:{timestamp}"
-        raw_sig = sign_message(message, self.private_key)
+        raw_sig = sign_message_with(self._signer(), message)
         # Ensure 0x prefix for viem compatibility on the Worker side
         signature = raw_sig if raw_sig.startswith("0x") else f"0x{raw_sig}"
         
@@ -478,113 +861,47 @@ class EcdsaPresignedUrlBackend:
         }
         if blobs:
             payload["blobs"] = blobs
-        
-        with httpx.Client(timeout=30) as client:
-            resp = client.post(
-                f"{self.credential_service_url}/presign",
-                json=payload,
-            )
-        
-        if resp.status_code != 200:
-            raise RuntimeError(
-                f"Credential service error: {resp.status_code} - {resp.text}"
-            )
-        return resp.json()
-    
-    # StorageBackend Protocol - delegates to same URL-based logic
-    
+        return self._post_presign(payload)
+
+
+# ============ Presigned Write Session ============
+
+
+@dataclass
+class PresignedWriteSession:
+    """
+    Write-only view of a presigned backend bound to one capsule.
+
+    Holds the URL map returned by a single presign request and serves
+    put_blob/put_document from it, so a capsule export signs once instead
+    of once per upload. Obtain one via ``backend.write_session()``.
+    """
+
+    backend: _PresignedBackendBase
+    capsule_id: str
+    urls: dict
+
     def put_blob(self, capsule_id: str, blob_id: str, data: bytes) -> str:
-        """Upload blob to R2 using presigned URL."""
-        urls = self._get_presigned_urls(capsule_id, "write", blobs=[blob_id])
-        url = urls.get("blobs", {}).get(blob_id)
-        if not url:
-            raise RuntimeError(f"No presigned URL for blob: {blob_id}")
-        
-        # 不加 Content-Type：R2 presigned PUT 未签该 header，带会 400
-        with httpx.Client(timeout=60) as client:
-            resp = client.put(url, content=data)
-        if resp.status_code not in (200, 201):
-            raise RuntimeError(f"Upload failed: {resp.status_code} - {resp.text!r}")
-        
-        return f"capsules/{capsule_id}/blobs/{blob_id}"
-    
-    def get_blob(self, ref: str) -> bytes:
-        """Download blob from R2."""
-        parts = ref.split("/")
-        if len(parts) < 5:
-            raise ValueError(f"Invalid blob reference: {ref}")
-        capsule_id = f"{parts[1]}/{parts[2]}"
-        blob_id = parts[-1]
-        
-        urls = self._get_presigned_urls(capsule_id, "read")
-        url = urls.get("blobs", {}).get(blob_id)
-        if not url:
-            raise RuntimeError(f"No presigned URL for blob: {blob_id}")
-        
-        with httpx.Client(timeout=60) as client:
-            resp = client.get(url)
-        resp.raise_for_status()
-        return resp.content
-    
-    def has_blob(self, ref: str) -> bool:
-        """Check if blob exists."""
-        try:
-            parts = ref.split("/")
-            if len(parts) < 5:
-                return False
-            capsule_id = f"{parts[1]}/{parts[2]}"
-            blob_id = parts[-1]
-            urls = self._get_presigned_urls(capsule_id, "read")
-            return blob_id in urls.get("blobs", {})
-        except Exception:
-            return False
-    
+        self._check_capsule(capsule_id)
+        return self.backend._upload_blob(self.urls, capsule_id, blob_id, data)
+
+    def put_blob_stream(self, capsule_id: str, blob_id: str, stream: BinaryIO) -> str:
+        self._check_capsule(capsule_id)
+        return self.backend._upload_blob(self.urls, capsule_id, blob_id, stream)
+
+    def put_blobs_batch(self, capsule_id: str, items: Sequence[tuple[str, bytes]]) -> list[str]:
+        self._check_capsule(capsule_id)
+        return _run_batch(
+            self.backend._upload_blob,
+            [(self.urls, capsule_id, bid, data) for bid, data in items],
+        )
+
     def put_document(self, capsule_id: str, path: str, data: bytes) -> None:
-        """Upload document using presigned URL."""
-        urls = self._get_presigned_urls(capsule_id, "write", blobs=[])
-        
-        if path in ("manifest.json", "capsule.manifest.json"):
-            url = urls.get("manifest")
-        elif path == "redaction.report.json":
-            url = urls.get("redaction_report")
-        else:
-            raise RuntimeError(f"Unknown document path: {path}")
-        
-        if not url:
-            raise RuntimeError(f"No presigned URL for document: {path}")
-        
-        with httpx.Client(timeout=60) as client:
-            resp = client.put(url, content=data, headers={"Content-Type": "application/json"})
-        if resp.status_code not in (200, 201):
-            raise RuntimeError(f"Upload failed: {resp.status_code}")
-    
-    def get_document(self, capsule_id: str, path: str) -> bytes:
-        """Download document using presigned URL."""
-        urls = self._get_presigned_urls(capsule_id, "read")
-        
-        if path in ("manifest.json", "capsule.manifest.json"):
-            url = urls.get("manifest")
-        elif path == "redaction.report.json":
-            url = urls.get("redaction_report")
-        else:
-            raise RuntimeError(f"Unknown document path: {path}")
-        
-        if not url:
-            raise RuntimeError(f"No presigned URL for document: {path}")
-        
-        with httpx.Client(timeout=60) as client:
-            resp = client.get(url)
-        resp.raise_for_status()
-        return resp.content
-    
-    def list(self, capsule_id: str, prefix: str) -> list[str]:
-        """List objects under prefix."""
-        urls = self._get_presigned_urls(capsule_id, "read")
-        
-        if prefix.startswith("blobs"):
-            return [
-                f"capsules/{capsule_id}/blobs/{blob_id}"
-                for blob_id in urls.get("blobs", {}).keys()
-            ]
-        
-        return []
+        self._check_capsule(capsule_id)
+        self.backend._upload_document(self.urls, path, data)
+
+    def _check_capsule(self, capsule_id: str) -> None:
+        if capsule_id != self.capsule_id:
+            raise ValueError(
+                f"Write session is bound to capsule {self.capsule_id}, not {capsule_id}"
+            )
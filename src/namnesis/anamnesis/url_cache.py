@@ -9,10 +9,18 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+from ..utils import json_dumps_bytes, json_loads
+
+# set() writes the timestamps ahead of the URL map, so listing can usually
+# read expires_at from the first few bytes instead of parsing every file.
+_HEAD_BYTES = 256
+_EXPIRES_AT_RE = re.compile(rb'"expires_at":\s*(\d+)\s*[,}]')
 
 
 @dataclass
@@ -58,11 +66,8 @@ class PresignedUrlCache:
             Cached URLs dict if valid, None if expired or not found
         """
         path = self._cache_path(capsule_id)
-        if not path.exists():
-            return None
-        
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = json_loads(path.read_bytes())
             expires_at = data.get("expires_at", 0)
             
             # Check if still valid (with buffer)
@@ -73,6 +78,8 @@ class PresignedUrlCache:
             path.unlink(missing_ok=True)
             return None
             
+        except FileNotFoundError:
+            return None
         except (json.JSONDecodeError, TypeError, KeyError, OSError):
             # Corrupted cache, delete it
             path.unlink(missing_ok=True)
@@ -89,16 +96,12 @@ class PresignedUrlCache:
         """
         path = self._cache_path(capsule_id)
         cache_data = {
-            "urls": urls,
             "expires_at": expires_at,
             "cached_at": int(time.time()),
+            "urls": urls,
         }
-        path.write_text(
-            json.dumps(cache_data, indent=2, sort_keys=True),
-            encoding="utf-8"
-        )
-        # Set secure permissions (cross-platform)
-        self._set_secure_permissions(path)
+        # Compact JSON: the cache is only ever read back by get()
+        self._atomic_write(path, json_dumps_bytes(cache_data))
     
     def clear(self, capsule_id: Optional[str] = None) -> None:
         """
@@ -111,8 +114,10 @@ class PresignedUrlCache:
         if capsule_id:
             self._cache_path(capsule_id).unlink(missing_ok=True)
         else:
-            for path in self.cache_dir.glob("urls_*.json"):
-                path.unlink(missing_ok=True)
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if self._is_cache_file(entry.name):
+                        Path(entry.path).unlink(missing_ok=True)
     
     def list_cached(self) -> list[dict]:
         """
@@ -121,26 +126,76 @@ class PresignedUrlCache:
         Returns:
             List of dicts with cache info (capsule_id, expires_at, status)
         """
-        results = []
-        for path in self.cache_dir.glob("urls_*.json"):
-            try:
-                data = json.loads(path.read_text(encoding="utf-8"))
-                expires_at = data.get("expires_at", 0)
-                remaining = int(expires_at - time.time())
+        return list(self.iter_cached())
+    
+    def iter_cached(self) -> Iterator[dict]:
+        """
+        Yield cached URL entries with metadata, one file at a time.
+        
+        Only the head of each file is read when it carries ``expires_at``
+        up front; older layouts fall back to a full parse.
+        
+        Yields:
+            Dicts with cache info (capsule_id, expires_at, status)
+        """
+        now = time.time()
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not self._is_cache_file(name):
+                    continue
                 # Reconstruct capsule_id from filename
-                capsule_id = path.stem.replace("urls_", "").replace("_", "/", 1)
-                results.append({
+                capsule_id = name[len("urls_"):-len(".json")].replace("_", "/", 1)
+                try:
+                    expires_at = self._read_expires_at(entry.path)
+                except FileNotFoundError:
+                    continue  # Removed since the directory scan
+                except (json.JSONDecodeError, UnicodeDecodeError, OSError, AttributeError):
+                    yield {
+                        "capsule_id": capsule_id,
+                        "status": "corrupted",
+                    }
+                    continue
+                remaining = int(expires_at - now)
+                yield {
                     "capsule_id": capsule_id,
                     "expires_at": expires_at,
                     "remaining_seconds": remaining,
                     "status": "valid" if remaining > 0 else "expired",
-                })
-            except (json.JSONDecodeError, OSError):
-                results.append({
-                    "capsule_id": path.stem.replace("urls_", "").replace("_", "/", 1),
-                    "status": "corrupted",
-                })
-        return results
+                }
+    
+    @staticmethod
+    def _is_cache_file(name: str) -> bool:
+        return name.startswith("urls_") and name.endswith(".json")
+    
+    @staticmethod
+    def _read_expires_at(path: str) -> int:
+        with open(path, "rb") as handle:
+            head = handle.read(_HEAD_BYTES)
+            match = _EXPIRES_AT_RE.search(head)
+            if match:
+                return int(match.group(1))
+            return json_loads(head + handle.read()).get("expires_at", 0)
+    
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        """
+        Write via a temp file and rename so readers never see partial JSON.
+        
+        Permissions are tightened on the temp file before it is moved into
+        place.
+        """
+        tmp = path.with_suffix(".tmp")
+        try:
+            with open(tmp, "wb") as handle:
+                handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+            # Set secure permissions (cross-platform)
+            self._set_secure_permissions(tmp)
+            os.replace(tmp, path)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            raise
     
     def _set_secure_permissions(self, path: Path) -> None:
         """
@@ -184,6 +184,9 @@ def validate(
     except CapsuleError as exc:
         click.echo(f"Validation failed: {exc}")
         sys.exit(exc.exit_code)
+    finally:
+        if isinstance(backend, PresignedUrlBackend):
+            backend.close()
 
 
 # ============ Cache Management ============
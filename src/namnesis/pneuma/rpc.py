@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import os
 import time
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
 import httpx
 from eth_abi import encode, decode
@@ -89,6 +89,57 @@ def _rpc_call(method: str, params: list, rpc_url: Optional[str] = None) -> Any:
     return data.get("result")
 
 
+def _rpc_batch(
+    requests: Sequence[tuple[str, list]],
+    rpc_url: Optional[str] = None,
+) -> list[tuple[bool, Any]]:
+    """
+    Make several JSON-RPC calls in a single batch POST.
+
+    Args:
+        requests: (method, params) pairs
+        rpc_url: RPC endpoint URL
+
+    Returns:
+        Exactly one (success, result-or-error) pair per request, in request
+        order, however the server orders its replies. A request whose id
+        is absent from the reply yields (False, "missing response").
+
+    Raises:
+        RuntimeError: If the batch itself is rejected
+    """
+    if not requests:
+        return []
+
+    url = rpc_url or get_rpc_url()
+    payload = [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": i}
+        for i, (method, params) in enumerate(requests)
+    ]
+
+    with httpx.Client(timeout=30) as client:
+        response = client.post(url, json=payload)
+        response.raise_for_status()
+        data = response.json()
+
+    if not isinstance(data, list):
+        # Servers answer a malformed or unsupported batch with one error object
+        raise RuntimeError(f"RPC error: {data.get('error', data)}")
+
+    # Batch responses may arrive in any order; match them up by id
+    by_id = {item.get("id"): item for item in data}
+    results: list[tuple[bool, Any]] = []
+    for i in range(len(requests)):
+        item = by_id.get(i)
+        if item is None:
+            results.append((False, "missing response"))
+        elif "error" in item:
+            results.append((False, item["error"]))
+        else:
+            results.append((True, item.get("result")))
+    return results
+
+
 def _encode_function_call(abi: list, function_name: str, args: list) -> str:
     """
     ABI-encode a function call.
@@ -202,6 +253,56 @@ def read_contract(
     return _decode_function_result(abi, function_name, result)
 
 
+def batch_read_contract(
+    calls: Sequence[tuple],
+    rpc_url: Optional[str] = None,
+    balance_of: Optional[str] = None,
+) -> list[tuple[bool, Any]]:
+    """
+    Read several contract values in one JSON-RPC batch round-trip.
+
+    Args:
+        calls: (contract_address, function_name, args, contract_name) tuples
+        rpc_url: RPC endpoint URL
+        balance_of: Address whose ETH balance (wei) is fetched in the same
+            batch and appended as the final entry
+
+    Returns:
+        One (success, value-or-error) pair per call, in call order
+    """
+    abis = []
+    requests = []
+    for contract_address, function_name, args, contract_name in calls:
+        abi = load_abi(contract_name)
+        calldata = _encode_function_call(abi, function_name, args or [])
+        abis.append(abi)
+        requests.append(
+            ("eth_call", [{"to": contract_address, "data": calldata}, "latest"])
+        )
+    if balance_of is not None:
+        requests.append(("eth_getBalance", [balance_of, "latest"]))
+
+    # _rpc_batch answers every request in order: the calls come first,
+    # then the balance read when one was requested
+    raw = _rpc_batch(requests, rpc_url=rpc_url)
+
+    results: list[tuple[bool, Any]] = []
+    for (ok, value), abi, call in zip(raw[:len(calls)], abis, calls, strict=True):
+        if not ok:
+            results.append((False, value))
+        elif value is None or value == "0x":
+            results.append((True, None))
+        else:
+            try:
+                results.append((True, _decode_function_result(abi, call[1], value)))
+            except Exception as e:
+                results.append((False, e))
+    if balance_of is not None:
+        ok, value = raw[len(calls)]
+        results.append((True, int(value, 16)) if ok else (False, value))
+    return results
+
+
 def get_balance(address: str, rpc_url: Optional[str] = None) -> int:
     """
     Get ETH balance for an address.
@@ -153,7 +153,22 @@ def sign_message(message: str, private_key: Optional[str] = None) -> str:
     Returns:
         0x-prefixed hex signature
     """
-    account = get_account(private_key)
+    return sign_message_with(get_account(private_key), message)
+
+
+def sign_message_with(account: LocalAccount, message: str) -> str:
+    """
+    Sign a message using EIP-191 personal_sign with an already-loaded account.
+
+    Lets callers that sign repeatedly skip re-parsing the private key.
+
+    Args:
+        account: LocalAccount from get_account()
+        message: The message string to sign
+
+    Returns:
+        0x-prefixed hex signature
+    """
     signable = encode_defunct(text=message)
     signed = account.sign_message(signable)
     return signed.signature.hex()
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import jsonschema
 from jsonschema import FormatChecker
 
+from ..utils import json_loads
+
 SCHEMA_NAMES = {
     "capsule.manifest.json": "capsule.manifest.schema.json",
     "redaction.report.json": "redaction.report.schema.json",
@@ -36,22 +39,24 @@ class SchemaRegistry:
         raise FileNotFoundError("Unable to locate Resurrectum schemas/v1 directory.")
 
     @classmethod
+    @cache
     def default(cls) -> "SchemaRegistry":
+        # The registry is immutable, so one discovered root per process is enough
         return cls(schema_root=cls.discover_root())
 
     def schema_path(self, schema_filename: str) -> Path:
         return self.schema_root / schema_filename
 
     def load_schema(self, schema_filename: str) -> dict[str, Any]:
-        path = self.schema_path(schema_filename)
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_loads(self.schema_path(schema_filename).read_bytes())
 
     def validator_for(self, schema_filename: str) -> jsonschema.Validator:
-        schema = self.load_schema(schema_filename)
-        validator_cls = jsonschema.validators.validator_for(schema)
-        validator_cls.check_schema(schema)
-        return validator_cls(schema, format_checker=FormatChecker())
+        return _compiled_validator(self.schema_path(schema_filename))
+
+    def precompile(self, schema_filenames: Iterable[str] | None = None) -> None:
+        """Compile validators up front (default: every schema in SCHEMA_NAMES)."""
+        for schema_filename in schema_filenames or SCHEMA_NAMES.values():
+            self.validator_for(schema_filename)
 
     def validate_instance(self, instance: dict[str, Any], schema_filename: str) -> None:
         validator = self.validator_for(schema_filename)
@@ -69,9 +74,18 @@ class SchemaRegistry:
         return f"{location}: {error.message}"
 
 
+@lru_cache(maxsize=None)
+def _compiled_validator(schema_path: Path) -> jsonschema.Validator:
+    # Validators are stateless across iter_errors() calls, so each schema file
+    # is parsed and checked once per process.
+    schema = json_loads(schema_path.read_bytes())
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema, format_checker=FormatChecker())
+
+
 def load_json(path: Path) -> dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return json_loads(path.read_bytes())
 
 
 def write_json(path: Path, payload: dict[str, Any]) -> None:
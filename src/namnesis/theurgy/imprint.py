@@ -118,6 +118,8 @@ def imprint(
     except CapsuleError as exc:
         click.secho(f"Export failed: {exc}", fg="red")
         sys.exit(exc.exit_code)
+    finally:
+        backend.close()
 
     # On-chain metadata update
     if not skip_chain_update:
@@ -136,6 +136,9 @@ def recall(
     except CapsuleError as exc:
         click.secho(f"Recall failed: {exc}", fg="red")
         sys.exit(exc.exit_code)
+    finally:
+        if isinstance(backend, PresignedUrlBackend):
+            backend.close()
 
     click.echo("")
     click.echo("=== Recall Complete ===")
@@ -1,57 +1,74 @@
 """Check current wallet and on-chain state before imprint test."""
 import os
 
-os.environ["SOUL_TOKEN_ADDRESS"] = "0x433bf2d2b72a7cf6cf682d90a10b00331d6c18d4"
-os.environ["SOUL_GUARD_ADDRESS"] = "0x9e2cef363f0058d36e899a8860f9c76c64e9a775"
-os.environ["BASE_SEPOLIA_RPC"] = "https://sepolia.base.org"
-os.environ["CHAIN_ID"] = "84532"
-
 from namnesis.sigil.eth import load_private_key, get_address
-from namnesis.pneuma.rpc import read_contract, get_balance
-
-pk = load_private_key()
-addr = get_address(pk)
-print(f"EOA Address: {addr}")
-
-# Check ETH balance
-balance_wei = get_balance(addr)
-balance_eth = balance_wei / 1e18
-print(f"ETH Balance: {balance_eth:.6f} ETH ({balance_wei} wei)")
-
-# Check current on-chain state
-soul_token = os.environ["SOUL_TOKEN_ADDRESS"]
-soul_id = 0
-
-owner = None
-try:
-    owner = read_contract(soul_token, "ownerOf", [soul_id], contract_name="SoulToken")
-    print(f"Soul NFT #0 Owner: {owner}")
-except Exception as e:
-    print(f"ownerOf failed: {e}")
-
-try:
-    cycles = read_contract(soul_token, "samsaraCycles", [soul_id], contract_name="SoulToken")
-    print(f"Current samsaraCycles: {cycles}")
-except Exception as e:
-    print(f"samsaraCycles failed: {e}")
-
-try:
-    size = read_contract(soul_token, "memorySize", [soul_id], contract_name="SoulToken")
-    print(f"Current memorySize: {size}")
-except Exception as e:
-    print(f"memorySize failed: {e}")
-
-try:
-    updated = read_contract(soul_token, "lastUpdated", [soul_id], contract_name="SoulToken")
-    print(f"Last Updated (block.timestamp): {updated}")
-    if updated:
-        from datetime import datetime, timezone
-        dt = datetime.fromtimestamp(updated, tz=timezone.utc)
-        print(f"Last Updated (UTC): {dt.isoformat()}")
-except Exception as e:
-    print(f"lastUpdated failed: {e}")
-
-print()
-owner_match = str(owner).lower() == addr.lower() if owner else False
-print(f"Owner matches EOA: {owner_match}")
-print(f"Has enough gas: {balance_eth > 0.0001}")
+from namnesis.pneuma.rpc import batch_read_contract
+
+# Base Sepolia deployment this script checks against
+CHAIN_ENV = {
+    "SOUL_TOKEN_ADDRESS": "0x433bf2d2b72a7cf6cf682d90a10b00331d6c18d4",
+    "SOUL_GUARD_ADDRESS": "0x9e2cef363f0058d36e899a8860f9c76c64e9a775",
+    "BASE_SEPOLIA_RPC": "https://sepolia.base.org",
+    "CHAIN_ID": "84532",
+}
+
+
+def main() -> None:
+    # Set here, not at import, so importing this module leaves os.environ alone
+    os.environ.update(CHAIN_ENV)
+
+    pk = load_private_key()
+    addr = get_address(pk)
+    print(f"EOA Address: {addr}")
+
+    # Fetch the balance and all on-chain state in one batched round-trip
+    soul_token = os.environ["SOUL_TOKEN_ADDRESS"]
+    soul_id = 0
+
+    reads = ["ownerOf", "samsaraCycles", "memorySize", "lastUpdated"]
+    results = batch_read_contract(
+        [(soul_token, name, [soul_id], "SoulToken") for name in reads],
+        balance_of=addr,
+    )
+    (owner_ok, owner), (cycles_ok, cycles), (size_ok, size), (updated_ok, updated), (balance_ok, balance_wei) = results
+
+    # Check ETH balance
+    if not balance_ok:
+        raise RuntimeError(f"eth_getBalance failed: {balance_wei}")
+    balance_eth = balance_wei / 1e18
+    print(f"ETH Balance: {balance_eth:.6f} ETH ({balance_wei} wei)")
+
+    # Check current on-chain state
+    if owner_ok:
+        print(f"Soul NFT #0 Owner: {owner}")
+    else:
+        print(f"ownerOf failed: {owner}")
+        owner = None
+
+    if cycles_ok:
+        print(f"Current samsaraCycles: {cycles}")
+    else:
+        print(f"samsaraCycles failed: {cycles}")
+
+    if size_ok:
+        print(f"Current memorySize: {size}")
+    else:
+        print(f"memorySize failed: {size}")
+
+    if updated_ok:
+        print(f"Last Updated (block.timestamp): {updated}")
+        if updated:
+            from datetime import datetime, timezone
+            dt = datetime.fromtimestamp(updated, tz=timezone.utc)
+            print(f"Last Updated (UTC): {dt.isoformat()}")
+    else:
+        print(f"lastUpdated failed: {updated}")
+
+    print()
+    owner_match = str(owner).lower() == addr.lower() if owner else False
+    print(f"Owner matches EOA: {owner_match}")
+    print(f"Has enough gas: {balance_eth > 0.0001}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import copy
 import json
+import os
 import shutil
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Callable
 
 import pytest
 
@@ -19,32 +23,66 @@ from namnesis.anamnesis.capsule import (
     validate_capsule,
 )
 from namnesis.sigil.crypto import blob_id
-from namnesis.sigil.eth import generate_eoa
 from namnesis.spec.redaction import RedactionPolicy
 from namnesis.spec.schemas import SchemaRegistry, load_json
 from namnesis.anamnesis.storage import LocalDirBackend
-from namnesis.utils import sha256_hex
+from namnesis.utils import sha256_hex_iter
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 FIXTURES_ROOT = REPO_ROOT / "conformance" / "fixtures"
 
 
-def _copy_fixture(name: str, tmp_path: Path) -> Path:
-    source = FIXTURES_ROOT / name
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Cross-device or no hardlink support on this filesystem
+        shutil.copy2(src, dst)
+
+
+@pytest.fixture(scope="session")
+def fixtures_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """One private copy of conformance/fixtures per session.
+
+    Per-test trees hardlink into this copy, never into the repo checkout, so
+    an in-place write can at worst corrupt the session copy.
+    """
+    target = tmp_path_factory.mktemp("fixtures") / "fixtures"
+    shutil.copytree(FIXTURES_ROOT, target)
+    return target
+
+
+def _copy_fixture(fixtures: Path, name: str, tmp_path: Path, mutable: bool = False) -> Path:
+    """Stage a fixture tree from the session copy under tmp_path.
+
+    Files are hardlinked unless ``mutable`` is set, so tests must only
+    delete or add files in the staged tree, never rewrite them in place.
+    """
+    source = fixtures / name
     target = tmp_path / name
-    shutil.copytree(source, target)
+    shutil.copytree(source, target, copy_function=shutil.copy2 if mutable else _link_or_copy)
     return target
 
 
-def _generate_key() -> tuple[str, str]:
-    """Generate an ECDSA key pair.  Returns (private_key_hex, address)."""
-    return generate_eoa()
+@lru_cache(maxsize=None)
+def _fixture_files(name: str) -> frozenset[str]:
+    """Relative POSIX paths of every file in a fixture tree, walked once per session."""
+    source = FIXTURES_ROOT / name
+    return frozenset(
+        os.path.relpath(os.path.join(root, file), source).replace(os.sep, "/")
+        for root, _, files in os.walk(source)
+        for file in files
+    )
 
 
-def _export_capsule(tmp_path: Path, workspace: Path) -> tuple[str, dict[str, object], LocalDirBackend, str]:
+def _export_capsule(
+    tmp_path: Path,
+    workspace: Path,
+    key: tuple[str, str],
+) -> tuple[str, dict[str, object], LocalDirBackend, str]:
     backend_root = tmp_path / "backend"
     backend = LocalDirBackend(backend_root)
-    private_key_hex, address = _generate_key()
+    private_key_hex, address = key
     options = ExportOptions(
         workspace=workspace,
         backend=backend,
@@ -57,39 +95,75 @@ def _export_capsule(tmp_path: Path, workspace: Path) -> tuple[str, dict[str, obj
     return capsule_id, manifest, backend, address
 
 
-def _snapshot_workspace(workspace: Path) -> dict[str, bytes]:
-    snapshot: dict[str, bytes] = {}
-    for path in sorted(workspace.rglob("*")):
-        if path.is_file():
-            snapshot[path.relative_to(workspace).as_posix()] = path.read_bytes()
-    return snapshot
-
-
-def test_round_trip_minimal_workspace(tmp_path: Path) -> None:
-    workspace = _copy_fixture("workspace_minimal", tmp_path)
-    original = _snapshot_workspace(workspace)
-
-    capsule_id, manifest, backend, address = _export_capsule(tmp_path, workspace)
+@pytest.fixture(scope="session")
+def exported_capsule(
+    tmp_path_factory: pytest.TempPathFactory,
+    fixtures_root: Path,
+    signing_key: tuple[str, str],
+) -> tuple[str, dict[str, object], Path, str]:
+    """Export workspace_minimal once.  Returns (capsule_id, manifest, backend_root, address)."""
+    root = tmp_path_factory.mktemp("exported")
+    workspace = _copy_fixture(fixtures_root, "workspace_minimal", root)
+    capsule_id, manifest, backend, address = _export_capsule(root, workspace, signing_key)
+    return capsule_id, manifest, backend.root, address
+
+
+def _clone_exported(
+    exported: tuple[str, dict[str, object], Path, str],
+    tmp_path: Path,
+    mutable: bool = False,
+) -> tuple[str, dict[str, object], LocalDirBackend, str]:
+    """Give a test its own backend holding the shared exported capsule.
+
+    Pass ``mutable=True`` when the test rewrites backend files in place;
+    otherwise the files are hardlinks shared with every other test.
+    """
+    capsule_id, manifest, backend_root, address = exported
+    target = tmp_path / "backend"
+    shutil.copytree(backend_root, target, copy_function=shutil.copy2 if mutable else _link_or_copy)
+    return capsule_id, copy.deepcopy(manifest), LocalDirBackend(target), address
+
+
+def _snapshot_workspace(workspace: Path) -> dict[str, str]:
+    """Map each workspace file to its SHA-256 digest, hashed in 64 KiB chunks."""
+    snapshot: dict[str, str] = {}
+    for root, _, files in os.walk(workspace):
+        for name in files:
+            full = os.path.join(root, name)
+            rel = os.path.relpath(full, workspace).replace(os.sep, "/")
+            with open(full, "rb") as f:
+                snapshot[rel] = sha256_hex_iter(iter(partial(f.read, 1 << 16), b""))
+    return dict(sorted(snapshot.items()))
+
+
+def test_round_trip_minimal_workspace(
+    tmp_path: Path,
+    schema_registry: SchemaRegistry,
+    exported_capsule: tuple[str, dict[str, object], Path, str],
+) -> None:
+    original = _snapshot_workspace(FIXTURES_ROOT / "workspace_minimal")
+
+    capsule_id, manifest, backend, address = _clone_exported(exported_capsule, tmp_path)
 
     backend_root = backend.root
     manifest_path = backend_root / "capsules" / capsule_id / "capsule.manifest.json"
     report_path = backend_root / "capsules" / capsule_id / "redaction.report.json"
 
-    registry = SchemaRegistry.default()
+    registry = schema_registry
     registry.validate_instance(load_json(manifest_path), "capsule.manifest.schema.json")
     registry.validate_instance(load_json(report_path), "redaction.report.schema.json")
 
     assert "schema_version" in manifest
 
-    shutil.rmtree(workspace)
-    workspace.mkdir(parents=True, exist_ok=True)
+    restored_workspace = tmp_path / "restored"
+    restored_workspace.mkdir()
 
-    restore_report_path = workspace / "restore.report.json"
+    restore_report_path = restored_workspace / "restore.report.json"
     import_capsule(
         ImportOptions(
             capsule_id=capsule_id,
             backend=backend,
-            target_workspace=workspace,
+            target_workspace=restored_workspace,
             trusted_fingerprints={address},
             overwrite=False,
             partial=False,
@@ -97,19 +171,23 @@ def test_round_trip_minimal_workspace(tmp_path: Path) -> None:
         )
     )
 
-    restored = _snapshot_workspace(workspace)
-    for rel_path, data in original.items():
+    restored = _snapshot_workspace(restored_workspace)
+    for rel_path, digest in original.items():
         assert rel_path in restored
-        assert restored[rel_path] == data
+        assert restored[rel_path] == digest
 
     registry.validate_instance(load_json(restore_report_path), "restore.report.schema.json")
 
 
-def test_policy_strict_blocks_forbidden_files(tmp_path: Path) -> None:
-    workspace = _copy_fixture("workspace_with_secrets", tmp_path)
+def test_policy_strict_blocks_forbidden_files(
+    tmp_path: Path,
+    fixtures_root: Path,
+    generated_key: tuple[str, str],
+) -> None:
+    workspace = _copy_fixture(fixtures_root, "workspace_with_secrets", tmp_path)
     backend_root = tmp_path / "backend"
     backend = LocalDirBackend(backend_root)
-    private_key_hex, _ = _generate_key()
+    private_key_hex, _ = generated_key
 
     with pytest.raises(PolicyViolationError) as exc:
         export_capsule(
@@ -137,8 +215,8 @@ def test_policy_strict_blocks_forbidden_files(tmp_path: Path) -> None:
     assert "sk-" not in report_text
 
 
-def test_dry_run_writes_report_only(tmp_path: Path) -> None:
-    workspace = _copy_fixture("workspace_minimal", tmp_path)
+def test_dry_run_writes_report_only(tmp_path: Path, fixtures_root: Path) -> None:
+    workspace = _copy_fixture(fixtures_root, "workspace_minimal", tmp_path)
     backend = LocalDirBackend(tmp_path / "backend")
 
     capsule_id, report = export_capsule(
@@ -159,9 +237,11 @@ def test_dry_run_writes_report_only(tmp_path: Path) -> None:
     assert report["capsule_id"] == capsule_id
 
 
-def test_tamper_detection_fails_validation(tmp_path: Path) -> None:
-    workspace = _copy_fixture("workspace_minimal", tmp_path)
-    capsule_id, manifest, backend, address = _export_capsule(tmp_path, workspace)
+def test_tamper_detection_fails_validation(
+    tmp_path: Path,
+    exported_capsule: tuple[str, dict[str, object], Path, str],
+) -> None:
+    capsule_id, manifest, backend, address = _clone_exported(exported_capsule, tmp_path, mutable=True)
 
     blob_entry = manifest["blobs"][0]
     blob_path = backend.root / blob_entry["storage"]["ref"]
@@ -180,13 +260,34 @@ def test_tamper_detection_fails_validation(tmp_path: Path) -> None:
     assert exc.value.exit_code == 5
 
 
-def test_signature_required(tmp_path: Path) -> None:
-    workspace = _copy_fixture("workspace_minimal", tmp_path)
-    capsule_id, manifest, backend, address = _export_capsule(tmp_path, workspace)
+def test_missing_blob_fails_validation(
+    tmp_path: Path,
+    exported_capsule: tuple[str, dict[str, object], Path, str],
+) -> None:
+    capsule_id, manifest, backend, address = _clone_exported(exported_capsule, tmp_path)
+
+    (backend.root / manifest["blobs"][-1]["storage"]["ref"]).unlink()
+
+    with pytest.raises(BlobInvalidError, match="Missing blob"):
+        validate_capsule(
+            ValidateOptions(
+                capsule_id=capsule_id,
+                backend=backend,
+                trusted_fingerprints={address},
+            )
+        )
+
+
+def test_signature_required(
+    tmp_path: Path,
+    exported_capsule: tuple[str, dict[str, object], Path, str],
+    write_manifest: Callable[[Path, dict], None],
+) -> None:
+    capsule_id, manifest, backend, address = _clone_exported(exported_capsule, tmp_path, mutable=True)
 
     manifest_path = backend.root / "capsules" / capsule_id / "capsule.manifest.json"
     manifest.pop("signature", None)
-    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    write_manifest(manifest_path, manifest)
 
     with pytest.raises(SignatureInvalidError) as exc:
         validate_capsule(
@@ -200,9 +301,11 @@ def test_signature_required(tmp_path: Path) -> None:
     assert exc.value.exit_code == 4
 
 
-def test_trusted_signer_pinning(tmp_path: Path) -> None:
-    workspace = _copy_fixture("workspace_minimal", tmp_path)
-    capsule_id, _, backend, _ = _export_capsule(tmp_path, workspace)
+def test_trusted_signer_pinning(
+    tmp_path: Path,
+    exported_capsule: tuple[str, dict[str, object], Path, str],
+) -> None:
+    capsule_id, _, backend, _ = _clone_exported(exported_capsule, tmp_path)
 
     with pytest.raises(SignatureInvalidError) as exc:
         validate_capsule(
@@ -216,9 +319,11 @@ def test_trusted_signer_pinning(tmp_path: Path) -> None:
     assert exc.value.exit_code == 4
 
 
-def test_manifest_consistency(tmp_path: Path) -> None:
-    workspace = _copy_fixture("workspace_minimal", tmp_path)
-    capsule_id, manifest, backend, address = _export_capsule(tmp_path, workspace)
+def test_manifest_consistency(
+    tmp_path: Path,
+    exported_capsule: tuple[str, dict[str, object], Path, str],
+) -> None:
+    capsule_id, manifest, backend, address = _clone_exported(exported_capsule, tmp_path)
 
     artifact_paths = [a["path"] for a in manifest["artifacts"]]
     blob_ids = [b["blob_id"] for b in manifest["blobs"]]
@@ -239,11 +344,15 @@ def test_manifest_consistency(tmp_path: Path) -> None:
     assert blob_id(blob_path.read_bytes()) == blob_entry["blob_id"]
 
 
-def test_redaction_report_coverage_and_summary(tmp_path: Path) -> None:
-    workspace = _copy_fixture("workspace_minimal", tmp_path)
+def test_redaction_report_coverage_and_summary(
+    tmp_path: Path,
+    fixtures_root: Path,
+    generated_key: tuple[str, str],
+) -> None:
+    workspace = _copy_fixture(fixtures_root, "workspace_minimal", tmp_path)
     backend_root = tmp_path / "backend"
     backend = LocalDirBackend(backend_root)
-    private_key_hex, _ = _generate_key()
+    private_key_hex, _ = generated_key
 
     capsule_id, _ = export_capsule(
         ExportOptions(
@@ -259,7 +368,8 @@ def test_redaction_report_coverage_and_summary(tmp_path: Path) -> None:
     report = load_json(backend_root / "capsules" / capsule_id / "redaction.report.json")
 
     decision_paths = {d["path"] for d in report["decisions"]}
-    workspace_paths = {p.relative_to(workspace).as_posix() for p in workspace.rglob("*") if p.is_file()}
+    workspace_paths = _fixture_files("workspace_minimal")
+    assert len(report["decisions"]) == len(workspace_paths)
     assert decision_paths == workspace_paths
 
     findings = report["findings"]
@@ -8,13 +8,13 @@ REPO_ROOT = Path(__file__).resolve().parents[2]
 EXAMPLES_ROOT = REPO_ROOT / "docs" / "examples"
 
 
-def test_examples_validate_against_schemas() -> None:
-    registry = SchemaRegistry.default()
+def test_examples_validate_against_schemas(schema_registry: SchemaRegistry) -> None:
+    registry = schema_registry
 
     assert EXAMPLES_ROOT.is_dir()
 
     validated = 0
-    for path in sorted(EXAMPLES_ROOT.rglob("*.json")):
+    for path in EXAMPLES_ROOT.rglob("*.json"):
         schema_name = SCHEMA_NAMES.get(path.name)
         if not schema_name:
             continue
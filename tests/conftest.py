@@ -0,0 +1,114 @@
+"""Shared pytest configuration."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+
+import pytest
+
+try:
+    import orjson
+except ImportError:  # optional speedup, same output either way
+    orjson = None
+
+# namnesis is imported inside the fixtures so that loading this conftest does
+# not run namnesis/__init__ before any test module is collected.
+if TYPE_CHECKING:
+    from namnesis.spec.schemas import SchemaRegistry
+
+# Ad-hoc scripts that talk to a live chain; run them directly, never collect.
+collect_ignore = ["_check_chain_state.py", "_check_sig.py"]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config: pytest.Config) -> None:
+    """Default to ``-n auto --dist=loadfile`` when pytest-xdist is installed.
+
+    Runs ahead of xdist's own hook so "auto" is resolved to a worker count.
+    loadfile keeps each module on one worker, so session fixtures stay warm.
+    Pass ``-n 0`` to run serially.
+    """
+    if not config.pluginmanager.hasplugin("xdist") or hasattr(config, "workerinput"):
+        return
+    if config.option.numprocesses is None:
+        config.option.numprocesses = "auto"
+        if config.option.dist == "no":
+            config.option.dist = "loadfile"
+
+
+@pytest.fixture(scope="session")
+def schema_registry() -> SchemaRegistry:
+    """Read-only schema registry shared by the whole session (one per xdist worker)."""
+    from namnesis.spec.schemas import SchemaRegistry
+
+    registry = SchemaRegistry.default()
+    registry.precompile()
+    return registry
+
+
+@pytest.fixture(scope="session")
+def signing_key() -> tuple[str, str]:
+    """ECDSA key pair for tests that only need *a* signer.  Returns (private_key_hex, address)."""
+    from namnesis.sigil.eth import generate_eoa
+
+    return generate_eoa()
+
+
+_SHM_DIR = "/dev/shm"
+
+
+@pytest.fixture
+def ram_tmp_path(tmp_path: Path) -> Iterator[Path]:
+    """Per-test directory on tmpfs when the platform has one, else ``tmp_path``.
+
+    Use it for storage backends, whose many small writes gain nothing from
+    a real disk.
+    """
+    if not (os.path.isdir(_SHM_DIR) and os.access(_SHM_DIR, os.W_OK)):
+        yield tmp_path
+        return
+    path = Path(tempfile.mkdtemp(prefix="namnesis-test-", dir=_SHM_DIR))
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+KEY_POOL_SIZE = 8
+
+
+@pytest.fixture(scope="session")
+def key_pool() -> list[tuple[str, str]]:
+    """Keys generated once per session and handed out by ``generated_key``."""
+    from namnesis.sigil.eth import generate_eoa
+
+    return [generate_eoa() for _ in range(KEY_POOL_SIZE)]
+
+
+@pytest.fixture
+def generated_key(key_pool: list[tuple[str, str]]) -> tuple[str, str]:
+    """A key no other test in this session has used.  Returns (private_key_hex, address)."""
+    if key_pool:
+        return key_pool.pop()
+    from namnesis.sigil.eth import generate_eoa
+
+    return generate_eoa()
+
+
+def _write_manifest(path: Path, manifest: dict) -> None:
+    if orjson is not None:
+        data = orjson.dumps(manifest, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    path.write_bytes(data + b"\n")
+
+
+@pytest.fixture(scope="session")
+def write_manifest() -> Callable[[Path, dict], None]:
+    """Rewrite a stored manifest as indented, key-sorted JSON (used to tamper with it)."""
+    return _write_manifest
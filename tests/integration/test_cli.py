@@ -8,22 +8,31 @@ CliRunner, without requiring network access or chain interaction.
 from __future__ import annotations
 
 import json
-import os
 from pathlib import Path
-from unittest.mock import patch
+from typing import TYPE_CHECKING
 
 import pytest
-from click.testing import CliRunner
 
-from namnesis.cli import cli
-from namnesis.sigil.eth import generate_eoa, save_private_key
+if TYPE_CHECKING:
+    import click
+    from click.testing import CliRunner
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def runner() -> CliRunner:
+    from click.testing import CliRunner
+
     return CliRunner()
 
 
+@pytest.fixture(scope="session")
+def cli_app() -> click.Group:
+    """The CLI group, imported on first use rather than at collection time."""
+    from namnesis.cli import cli
+
+    return cli
+
+
 @pytest.fixture()
 def namnesis_home(tmp_path: Path) -> Path:
     """Create a temporary ~/.namnesis directory."""
@@ -32,9 +41,21 @@ def namnesis_home(tmp_path: Path) -> Path:
     return home
 
 
+@pytest.fixture()
+def patched_paths(namnesis_home: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point every module-level NAMNESIS_DIR / NAMNESIS_ENV at the temp home."""
+    env_path = namnesis_home / ".env"
+    for module in ("namnesis.sigil.eth", "namnesis.theurgy.genesis"):
+        monkeypatch.setattr(f"{module}.NAMNESIS_DIR", namnesis_home)
+        monkeypatch.setattr(f"{module}.NAMNESIS_ENV", env_path)
+    return env_path
+
+
 @pytest.fixture()
 def wallet(namnesis_home: Path) -> tuple[str, str]:
     """Generate and save a wallet to the temp namnesis home."""
+    from namnesis.sigil.eth import generate_eoa, save_private_key
+
     private_key, address = generate_eoa()
     save_private_key(private_key, namnesis_home / ".env")
     return private_key, address
@@ -55,62 +76,73 @@ def workspace(tmp_path: Path) -> Path:
 class TestVersionAndInfo:
     """Test basic CLI commands that don't require wallet."""
 
-    def test_version(self, runner: CliRunner) -> None:
-        result = runner.invoke(cli, ["--version"])
+    def test_version(self, runner: CliRunner, cli_app: click.Group) -> None:
+        result = runner.invoke(cli_app, ["--version"])
         assert result.exit_code == 0
         assert "2.0.0" in result.output
 
-    def test_info(self, runner: CliRunner, wallet: tuple[str, str], namnesis_home: Path) -> None:
-        env_path = str(namnesis_home / ".env")
-        with patch("namnesis.sigil.eth.NAMNESIS_ENV", namnesis_home / ".env"):
-            with patch.dict(os.environ, {"PRIVATE_KEY": wallet[0]}):
-                result = runner.invoke(cli, ["info"])
-                assert result.exit_code == 0
-                assert "Namnesis v2.0.0" in result.output
+    def test_info(
+        self,
+        runner: CliRunner,
+        cli_app: click.Group,
+        wallet: tuple[str, str],
+        patched_paths: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("PRIVATE_KEY", wallet[0])
+        result = runner.invoke(cli_app, ["info"])
+        assert result.exit_code == 0
+        assert "Namnesis v2.0.0" in result.output
 
 
 class TestWhoami:
     """Test wallet identity display."""
 
-    def test_whoami_with_wallet(self, runner: CliRunner, wallet: tuple[str, str], namnesis_home: Path) -> None:
-        with patch("namnesis.sigil.eth.NAMNESIS_ENV", namnesis_home / ".env"):
-            with patch.dict(os.environ, {"PRIVATE_KEY": wallet[0]}):
-                result = runner.invoke(cli, ["whoami"])
-                assert result.exit_code == 0
-                assert "Address:" in result.output
+    def test_whoami_with_wallet(
+        self,
+        runner: CliRunner,
+        cli_app: click.Group,
+        wallet: tuple[str, str],
+        patched_paths: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("PRIVATE_KEY", wallet[0])
+        result = runner.invoke(cli_app, ["whoami"])
+        assert result.exit_code == 0
+        assert "Address:" in result.output
 
-    def test_whoami_without_wallet(self, runner: CliRunner) -> None:
-        env = {k: v for k, v in os.environ.items() if k != "PRIVATE_KEY"}
-        with patch.dict(os.environ, env, clear=True):
-            with patch("namnesis.sigil.eth.NAMNESIS_ENV", Path("/nonexistent/.env")):
-                result = runner.invoke(cli, ["whoami"])
-                assert result.exit_code != 0
-                assert "No wallet found" in result.output
+    def test_whoami_without_wallet(
+        self, runner: CliRunner, cli_app: click.Group, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv("PRIVATE_KEY", raising=False)
+        monkeypatch.setattr("namnesis.sigil.eth.NAMNESIS_ENV", Path("/nonexistent/.env"))
+        result = runner.invoke(cli_app, ["whoami"])
+        assert result.exit_code != 0
+        assert "No wallet found" in result.output
 
 
 class TestGenesis:
     """Test genesis command (skip-mint mode only, no chain)."""
 
-    def test_genesis_skip_mint(self, runner: CliRunner, tmp_path: Path) -> None:
-        namnesis_dir = tmp_path / ".namnesis"
-        env_path = namnesis_dir / ".env"
-
-        with patch("namnesis.sigil.eth.NAMNESIS_DIR", namnesis_dir):
-            with patch("namnesis.sigil.eth.NAMNESIS_ENV", env_path):
-                with patch("namnesis.theurgy.genesis.NAMNESIS_DIR", namnesis_dir):
-                    with patch("namnesis.theurgy.genesis.NAMNESIS_ENV", env_path):
-                        result = runner.invoke(cli, ["genesis", "--skip-mint"])
-                        assert result.exit_code == 0
-                        assert "Genesis Complete" in result.output
-                        assert "Address:" in result.output
-                        assert env_path.exists()
+    def test_genesis_skip_mint(self, runner: CliRunner, cli_app: click.Group, patched_paths: Path) -> None:
+        result = runner.invoke(cli_app, ["genesis", "--skip-mint"])
+        assert result.exit_code == 0
+        assert "Genesis Complete" in result.output
+        assert "Address:" in result.output
+        assert patched_paths.exists()
 
 
 class TestValidate:
     """Test validate command with local capsules."""
 
     def test_validate_local_capsule(
-        self, runner: CliRunner, workspace: Path, wallet: tuple[str, str], tmp_path: Path
+        self,
+        runner: CliRunner,
+        cli_app: click.Group,
+        workspace: Path,
+        wallet: tuple[str, str],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         from namnesis.anamnesis.capsule import ExportOptions, export_capsule
         from namnesis.anamnesis.storage import LocalDirBackend
@@ -130,28 +162,28 @@ class TestValidate:
             )
         )
 
-        with patch.dict(os.environ, {"PRIVATE_KEY": private_key}):
-            result = runner.invoke(
-                cli,
-                [
-                    "validate",
-                    "--capsule-id", capsule_id,
-                    "--path", str(backend_root),
-                    "--trusted-signer", address,
-                ],
-            )
-            assert result.exit_code == 0
-            assert "Validation passed" in result.output
+        monkeypatch.setenv("PRIVATE_KEY", private_key)
+        result = runner.invoke(
+            cli_app,
+            [
+                "validate",
+                "--capsule-id", capsule_id,
+                "--path", str(backend_root),
+                "--trusted-signer", address,
+            ],
+        )
+        assert result.exit_code == 0
+        assert "Validation passed" in result.output
 
 
 class TestCacheCommands:
     """Test cache management commands."""
 
-    def test_cache_clear(self, runner: CliRunner) -> None:
-        result = runner.invoke(cli, ["cache", "clear"])
+    def test_cache_clear(self, runner: CliRunner, cli_app: click.Group) -> None:
+        result = runner.invoke(cli_app, ["cache", "clear"])
         assert result.exit_code == 0
         assert "cleared" in result.output.lower() or "Cache" in result.output
 
-    def test_cache_info(self, runner: CliRunner) -> None:
-        result = runner.invoke(cli, ["cache", "info"])
+    def test_cache_info(self, runner: CliRunner, cli_app: click.Group) -> None:
+        result = runner.invoke(cli_app, ["cache", "info"])
         assert result.exit_code == 0
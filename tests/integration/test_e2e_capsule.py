@@ -9,9 +9,14 @@ These tests run entirely offline (local storage backend, no chain, no network).
 
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import json
+import os
 import shutil
+from functools import partial
 from pathlib import Path
+from typing import Callable
 
 import pytest
 
@@ -22,40 +27,57 @@ from namnesis.anamnesis.capsule import (
     ExportOptions,
     ImportOptions,
     PolicyViolationError,
+    RestoreFailedError,
     SignatureInvalidError,
     ValidateOptions,
     export_capsule,
     import_capsule,
     validate_capsule,
 )
-from namnesis.anamnesis.compression import CompressionOptions
+from namnesis.anamnesis.compression import (
+    CompressionError,
+    CompressionOptions,
+    compress_files,
+    compress_files_to_path,
+    compress_files_to_stream,
+    decompress_archive,
+    decompress_archive_from_stream,
+    estimate_compression_ratio,
+    train_dictionary,
+)
 from namnesis.anamnesis.storage import LocalDirBackend
 from namnesis.sigil.crypto import blob_id, verify_manifest_signature
 from namnesis.sigil.eth import generate_eoa, get_address
 from namnesis.spec.redaction import RedactionPolicy
 from namnesis.spec.schemas import SchemaRegistry, load_json
-from namnesis.utils import sha256_hex
+from namnesis.utils import json_loads, sha256_hex
+
+# Built once; no test mutates the policy, and export only reads it.
+_POLICY = RedactionPolicy.openclaw_default()
+
+# Every export here is strict under the default policy
+_EXPORT = partial(ExportOptions, policy=_POLICY, strict=True)
 
 
 # ============ Fixtures ============
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def key_pair() -> tuple[str, str]:
-    """Generate a fresh ECDSA key pair."""
+    """Generate an ECDSA key pair, shared by the whole session."""
     return generate_eoa()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def second_key_pair() -> tuple[str, str]:
     """Generate a second ECDSA key pair (for multi-signer tests)."""
     return generate_eoa()
 
 
-@pytest.fixture()
-def workspace(tmp_path: Path) -> Path:
-    """Create a realistic OpenClaw-compatible workspace."""
-    ws = tmp_path / "workspace"
+@pytest.fixture(scope="session")
+def workspace_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a realistic OpenClaw-compatible workspace once per session."""
+    ws = tmp_path_factory.mktemp("template") / "workspace"
     ws.mkdir()
 
     # Core identity files
@@ -72,7 +94,7 @@ def workspace(tmp_path: Path) -> Path:
         encoding="utf-8",
     )
     (memory_dir / "reflections.json").write_text(
-        json.dumps({"entries": [{"date": "2026-01-15", "text": "First reflection."}]}, indent=2),
+        json.dumps({"entries": [{"date": "2026-01-15", "text": "First reflection."}]}),
         encoding="utf-8",
     )
 
@@ -84,6 +106,18 @@ def workspace(tmp_path: Path) -> Path:
     return ws
 
 
+@pytest.fixture()
+def workspace(tmp_path: Path, workspace_template: Path) -> Path:
+    """Give a test its own copy of the template workspace to modify freely."""
+    return Path(shutil.copytree(workspace_template, tmp_path / "workspace"))
+
+
+@pytest.fixture(scope="session")
+def readonly_workspace(workspace_template: Path) -> Path:
+    """The shared template workspace, for tests that never write to it."""
+    return workspace_template
+
+
 @pytest.fixture()
 def workspace_with_secrets(tmp_path: Path) -> Path:
     """Create a workspace containing forbidden files."""
@@ -102,27 +136,78 @@ def workspace_with_secrets(tmp_path: Path) -> Path:
 
 
 @pytest.fixture()
-def backend(tmp_path: Path) -> LocalDirBackend:
-    """Create a local storage backend."""
-    backend_root = tmp_path / "storage"
+def backend(ram_tmp_path: Path) -> LocalDirBackend:
+    """Create a local storage backend (on tmpfs where available)."""
+    backend_root = ram_tmp_path / "storage"
     return LocalDirBackend(backend_root)
 
 
-@pytest.fixture()
-def schema_registry() -> SchemaRegistry:
-    """Load the default schema registry."""
-    return SchemaRegistry.default()
+@pytest.fixture(scope="session")
+def exported_capsule(
+    tmp_path_factory: pytest.TempPathFactory,
+    readonly_workspace: Path,
+    key_pair: tuple[str, str],
+) -> tuple[str, dict, LocalDirBackend]:
+    """Export the template workspace once.  Returns (capsule_id, manifest, backend).
+
+    Tests must treat the result as read-only; use ``_clone_backend`` first
+    when a test needs to rewrite stored files.
+    """
+    private_key, _ = key_pair
+    backend = LocalDirBackend(tmp_path_factory.mktemp("exported") / "storage")
+    capsule_id, manifest = export_capsule(
+        _EXPORT(
+            workspace=readonly_workspace,
+            backend=backend,
+            private_key_hex=private_key,
+        )
+    )
+    return capsule_id, manifest, backend
+
+
+def _clone_backend(backend: LocalDirBackend, tmp_path: Path) -> LocalDirBackend:
+    """Copy a backend's whole tree so a test can tamper with it in isolation."""
+    return LocalDirBackend(Path(shutil.copytree(backend.root, tmp_path / "storage")))
 
 
 def _snapshot(workspace: Path) -> dict[str, bytes]:
     """Capture file contents of a workspace keyed by relative POSIX paths."""
     snapshot: dict[str, bytes] = {}
-    for p in sorted(workspace.rglob("*")):
-        if p.is_file():
-            snapshot[p.relative_to(workspace).as_posix()] = p.read_bytes()
+    stack = [str(workspace)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    rel = os.path.relpath(entry.path, workspace).replace(os.sep, "/")
+                    with open(entry.path, "rb", buffering=0) as f:
+                        snapshot[rel] = f.read()
     return snapshot
 
 
+def _fingerprint(snapshot: dict[str, bytes | None]) -> str:
+    """One digest over sorted (path, sha256(content)) pairs; None marks a missing file."""
+    h = hashlib.sha256()
+    for rel_path in sorted(snapshot):
+        h.update(rel_path.encode("utf-8"))
+        h.update(b"\0")
+        data = snapshot[rel_path]
+        h.update(b"\0" * 32 if data is None else hashlib.sha256(data).digest())
+    return h.hexdigest()
+
+
+def _assert_restored(original: dict[str, bytes], restored: dict[str, bytes], context: str = "") -> None:
+    """Assert every original file came back byte-identical (extra restored files are allowed)."""
+    if _fingerprint(original) == _fingerprint({k: restored.get(k) for k in original}):
+        return
+    # Slow path: name the offending file
+    suffix = f" {context}" if context else ""
+    for rel_path, data in original.items():
+        assert rel_path in restored, f"Missing{suffix}: {rel_path}"
+        assert restored[rel_path] == data, f"Byte mismatch{suffix}: {rel_path}"
+
+
 # ============ Full Lifecycle Tests ============
 
 
@@ -137,12 +222,10 @@ class TestFullLifecycle:
 
         # --- Export ---
         capsule_id, manifest = export_capsule(
-            ExportOptions(
+            _EXPORT(
                 workspace=workspace,
                 backend=backend,
                 private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
             )
         )
 
@@ -190,9 +273,7 @@ class TestFullLifecycle:
         # Remove restore report from comparison
         restored.pop("restore.report.json", None)
 
-        for rel_path, data in original.items():
-            assert rel_path in restored, f"Missing file after restore: {rel_path}"
-            assert restored[rel_path] == data, f"Byte mismatch: {rel_path}"
+        _assert_restored(original, restored)
 
         # Verify restore report
         assert restore_report_path.exists()
@@ -210,12 +291,10 @@ class TestFullLifecycle:
         access = AccessControl(owner=address, readers=[second_addr], public=False)
 
         capsule_id, manifest = export_capsule(
-            ExportOptions(
+            _EXPORT(
                 workspace=workspace,
                 backend=backend,
                 private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
                 access=access,
             )
         )
@@ -233,19 +312,9 @@ class TestExport:
     """Tests for the export phase."""
 
     def test_export_produces_manifest_and_report(
-        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str]
+        self, exported_capsule: tuple[str, dict, LocalDirBackend]
     ) -> None:
-        private_key, address = key_pair
-
-        capsule_id, manifest = export_capsule(
-            ExportOptions(
-                workspace=workspace,
-                backend=backend,
-                private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
-            )
-        )
+        capsule_id, _, backend = exported_capsule
 
         capsule_root = backend.root / "capsules" / capsule_id
         assert (capsule_root / "capsule.manifest.json").exists()
@@ -253,19 +322,9 @@ class TestExport:
         assert (capsule_root / "blobs").is_dir()
 
     def test_every_artifact_has_matching_blob(
-        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str]
+        self, exported_capsule: tuple[str, dict, LocalDirBackend]
     ) -> None:
-        private_key, _ = key_pair
-
-        _, manifest = export_capsule(
-            ExportOptions(
-                workspace=workspace,
-                backend=backend,
-                private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
-            )
-        )
+        _, manifest, _ = exported_capsule
 
         blob_ids = {b["blob_id"] for b in manifest["blobs"]}
         for artifact in manifest["artifacts"]:
@@ -274,19 +333,9 @@ class TestExport:
             )
 
     def test_artifact_kind_classification(
-        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str]
+        self, exported_capsule: tuple[str, dict, LocalDirBackend]
     ) -> None:
-        private_key, _ = key_pair
-
-        _, manifest = export_capsule(
-            ExportOptions(
-                workspace=workspace,
-                backend=backend,
-                private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
-            )
-        )
+        _, manifest, _ = exported_capsule
 
         kinds = {a["path"]: a["kind"] for a in manifest["artifacts"]}
         assert kinds.get("MEMORY.md") == "memory"
@@ -297,20 +346,10 @@ class TestExport:
         assert kinds.get("projects/alpha/STATUS.md") == "project"
 
     def test_blob_hash_integrity(
-        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str]
+        self, exported_capsule: tuple[str, dict, LocalDirBackend]
     ) -> None:
         """Each stored blob must match its declared hash."""
-        private_key, _ = key_pair
-
-        capsule_id, manifest = export_capsule(
-            ExportOptions(
-                workspace=workspace,
-                backend=backend,
-                private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
-            )
-        )
+        _, manifest, backend = exported_capsule
 
         for blob_entry in manifest["blobs"]:
             data = backend.get_blob(blob_entry["storage"]["ref"])
@@ -318,19 +357,10 @@ class TestExport:
             assert blob_entry["hash"] == blob_entry["blob_id"]
 
     def test_manifest_signature_is_valid(
-        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str]
+        self, exported_capsule: tuple[str, dict, LocalDirBackend], key_pair: tuple[str, str]
     ) -> None:
-        private_key, address = key_pair
-
-        _, manifest = export_capsule(
-            ExportOptions(
-                workspace=workspace,
-                backend=backend,
-                private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
-            )
-        )
+        _, manifest, _ = exported_capsule
+        _, address = key_pair
 
         sig = manifest["signature"]
         assert sig["alg"] == "ecdsa_secp256k1_eip191"
@@ -353,12 +383,10 @@ class TestRedaction:
 
         with pytest.raises(PolicyViolationError) as exc_info:
             export_capsule(
-                ExportOptions(
+                _EXPORT(
                     workspace=workspace_with_secrets,
                     backend=backend,
                     private_key_hex=private_key,
-                    policy=RedactionPolicy.openclaw_default(),
-                    strict=True,
                 )
             )
 
@@ -371,12 +399,10 @@ class TestRedaction:
 
         with pytest.raises(PolicyViolationError):
             export_capsule(
-                ExportOptions(
+                _EXPORT(
                     workspace=workspace_with_secrets,
                     backend=backend,
                     private_key_hex=private_key,
-                    policy=RedactionPolicy.openclaw_default(),
-                    strict=True,
                 )
             )
 
@@ -392,12 +418,10 @@ class TestRedaction:
         self, workspace: Path, backend: LocalDirBackend
     ) -> None:
         capsule_id, report = export_capsule(
-            ExportOptions(
+            _EXPORT(
                 workspace=workspace,
                 backend=backend,
                 private_key_hex=None,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
                 dry_run=True,
             )
         )
@@ -420,12 +444,10 @@ class TestImport:
         private_key, address = key_pair
 
         capsule_id, _ = export_capsule(
-            ExportOptions(
+            _EXPORT(
                 workspace=workspace,
                 backend=backend,
                 private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
             )
         )
 
@@ -449,12 +471,10 @@ class TestImport:
         private_key, address = key_pair
 
         capsule_id, _ = export_capsule(
-            ExportOptions(
+            _EXPORT(
                 workspace=workspace,
                 backend=backend,
                 private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
             )
         )
 
@@ -483,12 +503,10 @@ class TestImport:
         _, untrusted_address = second_key_pair
 
         capsule_id, _ = export_capsule(
-            ExportOptions(
+            _EXPORT(
                 workspace=workspace,
                 backend=backend,
                 private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
             )
         )
 
@@ -511,12 +529,10 @@ class TestImport:
         private_key, address = key_pair
 
         capsule_id, manifest = export_capsule(
-            ExportOptions(
+            _EXPORT(
                 workspace=workspace,
                 backend=backend,
                 private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
             )
         )
 
@@ -545,12 +561,10 @@ class TestImport:
         private_key, address = key_pair
 
         capsule_id, manifest = export_capsule(
-            ExportOptions(
+            _EXPORT(
                 workspace=workspace,
                 backend=backend,
                 private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
             )
         )
 
@@ -589,28 +603,21 @@ class TestSignature:
     """Tests for manifest signature integrity."""
 
     def test_removed_signature_detected(
-        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str]
+        self,
+        exported_capsule: tuple[str, dict, LocalDirBackend],
+        key_pair: tuple[str, str],
+        tmp_path: Path,
+        write_manifest: Callable[[Path, dict], None],
     ) -> None:
-        private_key, address = key_pair
-
-        capsule_id, _ = export_capsule(
-            ExportOptions(
-                workspace=workspace,
-                backend=backend,
-                private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
-            )
-        )
+        capsule_id, _, shared_backend = exported_capsule
+        _, address = key_pair
+        backend = _clone_backend(shared_backend, tmp_path)
 
         # Remove signature from stored manifest
         manifest_path = backend.root / "capsules" / capsule_id / "capsule.manifest.json"
-        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest = json_loads(manifest_path.read_bytes())
         manifest.pop("signature", None)
-        manifest_path.write_text(
-            json.dumps(manifest, indent=2, sort_keys=True) + "\n",
-            encoding="utf-8",
-        )
+        write_manifest(manifest_path, manifest)
 
         with pytest.raises(SignatureInvalidError):
             validate_capsule(
@@ -622,29 +629,22 @@ class TestSignature:
             )
 
     def test_modified_manifest_detected(
-        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str]
+        self,
+        exported_capsule: tuple[str, dict, LocalDirBackend],
+        key_pair: tuple[str, str],
+        tmp_path: Path,
+        write_manifest: Callable[[Path, dict], None],
     ) -> None:
         """Changing any manifest field invalidates the signature."""
-        private_key, address = key_pair
-
-        capsule_id, _ = export_capsule(
-            ExportOptions(
-                workspace=workspace,
-                backend=backend,
-                private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
-            )
-        )
+        capsule_id, _, shared_backend = exported_capsule
+        _, address = key_pair
+        backend = _clone_backend(shared_backend, tmp_path)
 
         # Modify a field but keep the signature
         manifest_path = backend.root / "capsules" / capsule_id / "capsule.manifest.json"
-        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest = json_loads(manifest_path.read_bytes())
         manifest["schema_version"] = "9.9.9"  # tamper
-        manifest_path.write_text(
-            json.dumps(manifest, indent=2, sort_keys=True) + "\n",
-            encoding="utf-8",
-        )
+        write_manifest(manifest_path, manifest)
 
         with pytest.raises((SignatureInvalidError, CapsuleError)):
             validate_capsule(
@@ -656,22 +656,16 @@ class TestSignature:
             )
 
     def test_cross_signer_validation(
-        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str], second_key_pair: tuple[str, str]
+        self,
+        exported_capsule: tuple[str, dict, LocalDirBackend],
+        key_pair: tuple[str, str],
+        second_key_pair: tuple[str, str],
     ) -> None:
         """Capsule signed by key A should not validate with only key B trusted."""
-        private_key_a, address_a = key_pair
+        capsule_id, _, backend = exported_capsule
+        _, address_a = key_pair
         _, address_b = second_key_pair
 
-        capsule_id, _ = export_capsule(
-            ExportOptions(
-                workspace=workspace,
-                backend=backend,
-                private_key_hex=private_key_a,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
-            )
-        )
-
         with pytest.raises(SignatureInvalidError):
             validate_capsule(
                 ValidateOptions(
@@ -691,22 +685,16 @@ class TestSignature:
         )
 
     def test_multi_trusted_signers(
-        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str], second_key_pair: tuple[str, str]
+        self,
+        exported_capsule: tuple[str, dict, LocalDirBackend],
+        key_pair: tuple[str, str],
+        second_key_pair: tuple[str, str],
     ) -> None:
         """Validation should pass if signer is in the trusted set."""
-        private_key, address = key_pair
+        capsule_id, _, backend = exported_capsule
+        _, address = key_pair
         _, address_b = second_key_pair
 
-        capsule_id, _ = export_capsule(
-            ExportOptions(
-                workspace=workspace,
-                backend=backend,
-                private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
-            )
-        )
-
         # Validate with both trusted — should pass
         validate_capsule(
             ValidateOptions(
@@ -723,12 +711,9 @@ class TestSignature:
 class TestCompression:
     """Tests for 7z compression mode (skipped if py7zr not installed)."""
 
-    @pytest.fixture(autouse=True)
-    def _skip_if_no_7z(self) -> None:
-        try:
-            import py7zr  # noqa: F401
-        except ImportError:
-            pytest.skip("py7zr not installed")
+    pytestmark = pytest.mark.skipif(
+        importlib.util.find_spec("py7zr") is None, reason="py7zr not installed"
+    )
 
     def test_compressed_round_trip(
         self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str]
@@ -737,12 +722,10 @@ class TestCompression:
         original = _snapshot(workspace)
 
         capsule_id, manifest = export_capsule(
-            ExportOptions(
+            _EXPORT(
                 workspace=workspace,
                 backend=backend,
                 private_key_hex=private_key,
-                policy=RedactionPolicy.openclaw_default(),
-                strict=True,
                 compression=CompressionOptions(enabled=True, algorithm="7z", level=9),
             )
         )
@@ -768,37 +751,174 @@ class TestCompression:
         )
 
         restored = _snapshot(workspace)
-        for rel_path, data in original.items():
-            assert rel_path in restored, f"Missing after compressed restore: {rel_path}"
-            assert restored[rel_path] == data, f"Byte mismatch after compressed restore: {rel_path}"
+        _assert_restored(original, restored, "after compressed restore")
+
+    def test_compress_to_path_matches_in_memory(self, workspace: Path, tmp_path: Path) -> None:
+        files = sorted(_snapshot(workspace))
+        options = CompressionOptions(enabled=True)
+
+        in_memory = compress_files(workspace, files, options)
+        out_path = tmp_path / "archive.7z"
+        on_disk = compress_files_to_path(workspace, files, options, out_path)
+
+        assert on_disk.archive_data is None
+        assert on_disk.original_size == in_memory.original_size
+        assert on_disk.compressed_size == out_path.stat().st_size
+
+        target = tmp_path / "extracted"
+        target.mkdir()
+        decompress_archive(out_path.read_bytes(), target, files)
+        assert _snapshot(target) == _snapshot(workspace)
+
+    def test_stream_round_trip(self, workspace: Path, tmp_path: Path) -> None:
+        import io
+
+        files = sorted(_snapshot(workspace))
+        out_stream = io.BytesIO()
+        result = compress_files_to_stream(workspace, files, CompressionOptions(enabled=True), out_stream)
+
+        assert result.archive_data is None
+        assert result.compressed_size == len(out_stream.getvalue())
+
+        out_stream.seek(0)
+        target = tmp_path / "extracted"
+        target.mkdir()
+        extracted = decompress_archive_from_stream(out_stream, target, files)
+        assert sorted(extracted) == files
+        assert _snapshot(target) == _snapshot(workspace)
+
+    def test_extraction_enforces_size_limit(self, workspace: Path, tmp_path: Path) -> None:
+        files = sorted(_snapshot(workspace))
+        result = compress_files(workspace, files, CompressionOptions(enabled=True))
+
+        target = tmp_path / "extracted"
+        target.mkdir()
+        with pytest.raises(CompressionError, match="limit"):
+            decompress_archive(
+                result.archive_data, target, files,
+                max_uncompressed_bytes=result.original_size - 1,
+            )
+        assert not any(target.iterdir())
+
+    def test_estimate_short_circuits_incompressible_data(self) -> None:
+        assert estimate_compression_ratio(os.urandom(8192)) == pytest.approx(0.99)
+        assert estimate_compression_ratio(b"hello memory\n" * 1000) < 0.5
+
+
+class TestZstdCompression:
+    """Tests for zstd tar compression with a trained dictionary (skipped if zstandard not installed)."""
+
+    pytestmark = pytest.mark.skipif(
+        importlib.util.find_spec("zstandard") is None, reason="zstandard not installed"
+    )
+
+    @staticmethod
+    def _export(
+        workspace: Path, backend: LocalDirBackend, private_key: str
+    ) -> tuple[str, dict, CompressionOptions]:
+        files = sorted(_snapshot(workspace))
+        options = CompressionOptions(
+            enabled=True,
+            algorithm="zstd",
+            level=9,
+            dictionary=train_dictionary([workspace / f for f in files] * 20, size=4096),
+        )
+        capsule_id, manifest = export_capsule(
+            _EXPORT(
+                workspace=workspace,
+                backend=backend,
+                private_key_hex=private_key,
+                compression=options,
+            )
+        )
+        return capsule_id, manifest, options
+
+    def test_zstd_capsule_round_trip(
+        self, workspace: Path, backend: LocalDirBackend, key_pair: tuple[str, str]
+    ) -> None:
+        private_key, address = key_pair
+        original = _snapshot(workspace)
+        capsule_id, manifest, options = self._export(workspace, backend, private_key)
+
+        assert manifest["compression"]["algorithm"] == "zstd"
+        assert manifest["compression"]["dictionary_sha256"] == sha256_hex(options.dictionary)
+        archive_blobs = [b for b in manifest["blobs"] if b.get("is_archive")]
+        assert archive_blobs[0]["archive_format"] == "tar.zst"
+
+        shutil.rmtree(workspace)
+        workspace.mkdir(parents=True)
+
+        import_capsule(
+            ImportOptions(
+                capsule_id=capsule_id,
+                backend=backend,
+                target_workspace=workspace,
+                trusted_fingerprints={address},
+                compression_dictionary=options.dictionary,
+            )
+        )
+        assert _snapshot(workspace) == original
+
+    @pytest.mark.parametrize(
+        "dictionary, message",
+        [(None, "compressed with a zstd dictionary"), (b"not the export dictionary", "does not match")],
+        ids=["missing", "wrong"],
+    )
+    def test_zstd_import_checks_dictionary(
+        self,
+        workspace: Path,
+        backend: LocalDirBackend,
+        key_pair: tuple[str, str],
+        dictionary: bytes | None,
+        message: str,
+    ) -> None:
+        private_key, address = key_pair
+        capsule_id, _, _ = self._export(workspace, backend, private_key)
+        target = workspace.parent / "restore_target"
+        target.mkdir()
+
+        with pytest.raises(RestoreFailedError, match=message):
+            import_capsule(
+                ImportOptions(
+                    capsule_id=capsule_id,
+                    backend=backend,
+                    target_workspace=target,
+                    trusted_fingerprints={address},
+                    compression_dictionary=dictionary,
+                )
+            )
+        assert not any(target.iterdir())
 
 
 # ============ Identity Tests ============
 
 
+IDENTITY_POOL_SIZE = 8
+
+
+@pytest.fixture(scope="module")
+def identity_pool() -> list[tuple[str, str]]:
+    """Key pairs generated once and shared by every TestIdentity assertion."""
+    return [generate_eoa() for _ in range(IDENTITY_POOL_SIZE)]
+
+
 class TestIdentity:
     """Tests for ECDSA wallet identity operations."""
 
-    def test_generate_eoa_returns_valid_address(self) -> None:
-        private_key, address = generate_eoa()
+    @pytest.mark.parametrize("idx", range(IDENTITY_POOL_SIZE))
+    def test_generated_key_pair_is_well_formed(
+        self, identity_pool: list[tuple[str, str]], idx: int
+    ) -> None:
+        private_key, address = identity_pool[idx]
         assert private_key.startswith("0x")
         assert len(private_key) == 66  # 0x + 64 hex chars
         assert address.startswith("0x")
         assert len(address) == 42  # 0x + 40 hex chars
 
-    def test_get_address_from_private_key(self) -> None:
-        private_key, expected_address = generate_eoa()
-        actual_address = get_address(private_key)
-        assert actual_address == expected_address
-
-    def test_different_keys_produce_different_addresses(self) -> None:
-        _, addr1 = generate_eoa()
-        _, addr2 = generate_eoa()
-        assert addr1 != addr2
+        # Address derivation matches what generate_eoa returned
+        assert get_address(private_key) == address
 
-    def test_address_is_checksummed(self) -> None:
-        """Ethereum address should use EIP-55 mixed-case checksum."""
-        _, address = generate_eoa()
+        # Ethereum address should use EIP-55 mixed-case checksum.
         # A checksummed address has mixed case (not all lower or all upper)
         hex_part = address[2:]
         has_upper = any(c.isupper() for c in hex_part if c.isalpha())
@@ -806,3 +926,8 @@ class TestIdentity:
         # Most addresses will have mixed case; all-numeric addresses are rare
         if any(c.isalpha() for c in hex_part):
             assert has_upper or has_lower
+
+    def test_different_keys_produce_different_addresses(
+        self, identity_pool: list[tuple[str, str]]
+    ) -> None:
+        assert len({address for _, address in identity_pool}) == IDENTITY_POOL_SIZE
@@ -0,0 +1,67 @@
+"""Unit tests for archive member-name vetting in anamnesis/compression.py."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from namnesis.anamnesis import compression
+from namnesis.anamnesis.compression import CompressionError, _check_member_name
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "MEMORY.md",
+        "memory/notes.md",
+        "projects/a/STATUS.md",
+        "./memory/notes.md",
+        # a colon is an ordinary character in POSIX names
+        "notes:2024.md",
+        "memory/12:30.md",
+    ],
+)
+def test_safe_member_names_pass(name: str) -> None:
+    _check_member_name(name)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        # absolute paths
+        "/etc/passwd",
+        "\\windows\\system32",
+        # parent traversal
+        "../escape.md",
+        "memory/../../escape.md",
+        "memory\\..\\..\\escape.md",
+        # drive-colon names
+        "C:/evil.md",
+        "c:evil.md",
+        "C:\\evil.md",
+        "//server/share/evil.md",
+        # empty names
+        "",
+        ".",
+        "./",
+    ],
+)
+def test_unsafe_member_names_rejected(name: str) -> None:
+    with pytest.raises(CompressionError, match="Unsafe path"):
+        _check_member_name(name)
+
+
+def test_ratio_cache_survives_parallel_estimates(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("py7zr")
+    monkeypatch.setattr(compression, "_RATIO_CACHE_MAX", 4)
+    monkeypatch.setattr(compression, "_ratio_cache", {})
+    # Compressible but distinct samples, so every call misses and evicts.
+    samples = [(b"%04d" % i + os.urandom(8)) * 512 for i in range(32)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ratios = list(executor.map(compression.estimate_compression_ratio, samples))
+
+    assert all(0 < ratio < 1 for ratio in ratios)
+    assert len(compression._ratio_cache) <= 4
@@ -0,0 +1,133 @@
+"""Unit tests for JSON-RPC batching in pneuma/rpc.py, against a mocked transport."""
+
+from __future__ import annotations
+
+import json
+from functools import partial
+from typing import Any, Callable
+
+import httpx
+import pytest
+from eth_abi import encode
+
+from namnesis.pneuma import rpc
+
+RPC_URL = "https://rpc.invalid"
+OWNER = "0x" + "11" * 20
+TOKEN = "0x" + "22" * 20
+
+# Minimal ABI so the tests do not depend on Foundry build artifacts
+TEST_ABI = [
+    {
+        "type": "function",
+        "name": "samsaraCycles",
+        "inputs": [{"name": "soulId", "type": "uint256"}],
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+    },
+    {
+        "type": "function",
+        "name": "ownerOf",
+        "inputs": [{"name": "tokenId", "type": "uint256"}],
+        "outputs": [{"name": "", "type": "address"}],
+        "stateMutability": "view",
+    },
+]
+
+
+def _uint(value: int) -> str:
+    return "0x" + encode(["uint256"], [value]).hex()
+
+
+def _address(value: str) -> str:
+    return "0x" + encode(["address"], [value]).hex()
+
+
+@pytest.fixture
+def rpc_server(monkeypatch: pytest.MonkeyPatch) -> Callable[[Callable[[list], Any]], list]:
+    """Route rpc's httpx.Client through ``reply(batch) -> body`` and record each batch."""
+    monkeypatch.setattr(rpc, "load_abi", lambda name: TEST_ABI)
+    batches: list[list] = []
+
+    def install(reply: Callable[[list], Any]) -> list:
+        def handler(request: httpx.Request) -> httpx.Response:
+            batch = json.loads(request.content)
+            batches.append(batch)
+            return httpx.Response(200, json=reply(batch))
+
+        monkeypatch.setattr(
+            rpc.httpx, "Client", partial(httpx.Client, transport=httpx.MockTransport(handler))
+        )
+        return batches
+
+    return install
+
+
+def test_rpc_batch_matches_out_of_order_replies_by_id(rpc_server) -> None:
+    rpc_server(lambda batch: [{"jsonrpc": "2.0", "id": r["id"], "result": f"r{r['id']}"} for r in reversed(batch)])
+
+    results = rpc._rpc_batch([("a", []), ("b", []), ("c", [])], rpc_url=RPC_URL)
+    assert results == [(True, "r0"), (True, "r1"), (True, "r2")]
+
+
+def test_rpc_batch_reports_error_items_and_missing_ids(rpc_server) -> None:
+    error = {"code": -32000, "message": "execution reverted"}
+    rpc_server(lambda batch: [
+        {"jsonrpc": "2.0", "id": 2, "result": "ok"},
+        {"jsonrpc": "2.0", "id": 0, "error": error},
+    ])
+
+    results = rpc._rpc_batch([("a", []), ("b", []), ("c", [])], rpc_url=RPC_URL)
+    assert results == [(False, error), (False, "missing response"), (True, "ok")]
+
+
+def test_rpc_batch_raises_on_single_error_object(rpc_server) -> None:
+    rpc_server(lambda batch: {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch too large"}})
+
+    with pytest.raises(RuntimeError, match="batch too large"):
+        rpc._rpc_batch([("a", []), ("b", [])], rpc_url=RPC_URL)
+
+
+def test_rpc_batch_empty_skips_the_request(rpc_server) -> None:
+    batches = rpc_server(lambda batch: [])
+    assert rpc._rpc_batch([], rpc_url=RPC_URL) == []
+    assert batches == []
+
+
+def _calls() -> list[tuple]:
+    return [
+        (TOKEN, "samsaraCycles", [7], "SoulToken"),
+        (TOKEN, "ownerOf", [7], "SoulToken"),
+    ]
+
+
+def test_batch_read_contract_decodes_out_of_order_replies(rpc_server) -> None:
+    replies = {0: _uint(3), 1: _address(OWNER), 2: hex(10**18)}
+    batches = rpc_server(lambda batch: [
+        {"jsonrpc": "2.0", "id": r["id"], "result": replies[r["id"]]} for r in reversed(batch)
+    ])
+
+    results = rpc.batch_read_contract(_calls(), rpc_url=RPC_URL, balance_of=OWNER)
+
+    assert results == [(True, 3), (True, OWNER), (True, 10**18)]
+    assert len(batches) == 1
+    assert [r["method"] for r in batches[0]] == ["eth_call", "eth_call", "eth_getBalance"]
+
+
+def test_batch_read_contract_keeps_failures_in_place(rpc_server) -> None:
+    error = {"code": -32000, "message": "ERC721NonexistentToken"}
+    rpc_server(lambda batch: [
+        {"jsonrpc": "2.0", "id": 0, "result": "0x"},
+        {"jsonrpc": "2.0", "id": 1, "error": error},
+        # id 2 (the balance read) is missing from the reply
+    ])
+
+    results = rpc.batch_read_contract(_calls(), rpc_url=RPC_URL, balance_of=OWNER)
+    assert results == [(True, None), (False, error), (False, "missing response")]
+
+
+def test_batch_read_contract_raises_on_single_error_object(rpc_server) -> None:
+    rpc_server(lambda batch: {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "invalid request"}})
+
+    with pytest.raises(RuntimeError, match="invalid request"):
+        rpc.batch_read_contract(_calls(), rpc_url=RPC_URL, balance_of=OWNER)
@@ -0,0 +1,36 @@
+"""Unit tests for EIP-191 message signing in sigil/eth.py."""
+
+from __future__ import annotations
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from namnesis.sigil.eth import get_address, sign_message
+
+# Fixed test key: no keygen and no .env read, and RFC 6979 makes the signature deterministic
+TEST_KEY = "0x" + "ab" * 32
+TEST_ADDRESS = "0xe239cdc5fbe977a8a141B72194D3CF8c41bC5BC6"
+TEST_SIGNATURE = (
+    "35cee447ecbbe29a62f142b2e136776aeb70f8e05a082083130cab793049ab48"
+    "287c34a3cf329005b9df8f9c6334369c9563f446480bf863db10dd58d50015921b"
+)
+
+
+def test_get_address_for_fixed_key() -> None:
+    assert get_address(TEST_KEY) == TEST_ADDRESS
+
+
+@pytest.mark.parametrize("message", ["test", "capsule:write:1700000000", ""])
+def test_sign_message_shape_and_recovery(message: str) -> None:
+    sig = sign_message(message, TEST_KEY)
+    # hexbytes >= 1.0 drops the 0x prefix; callers normalize it themselves
+    raw = sig.removeprefix("0x")
+    assert len(raw) == 130
+    int(raw, 16)
+    recovered = Account.recover_message(encode_defunct(text=message), signature="0x" + raw)
+    assert recovered == TEST_ADDRESS
+
+
+def test_sign_message_is_deterministic() -> None:
+    assert sign_message("test", TEST_KEY).removeprefix("0x") == TEST_SIGNATURE
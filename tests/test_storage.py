@@ -0,0 +1,452 @@
+"""Unit tests for anamnesis/storage.py helpers that need no network."""
+
+from __future__ import annotations
+
+import dataclasses
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+import httpx
+import pytest
+
+from namnesis.anamnesis import storage
+from namnesis.anamnesis.storage import (
+    EcdsaPresignedUrlBackend,
+    LocalDirBackend,
+    PresignedUrlBackend,
+    PresignedWriteSession,
+    _ReadUrlCache,
+    _run_batch,
+    get_blobs,
+    put_blobs,
+    write_session,
+)
+
+TEST_KEY = "0x" + "ab" * 32
+
+
+@pytest.fixture(
+    params=[
+        lambda: PresignedUrlBackend("http://relay.invalid", TEST_KEY),
+        lambda: EcdsaPresignedUrlBackend("http://relay.invalid", 1, TEST_KEY),
+    ],
+    ids=["presigned", "ecdsa"],
+)
+def presigned_backend(request: pytest.FixtureRequest):
+    return request.param()
+
+
+def test_http_client_is_not_an_init_parameter(presigned_backend) -> None:
+    init_names = {f.name for f in dataclasses.fields(presigned_backend) if f.init}
+    assert "_http_client" not in init_names
+    assert "_http_client" not in repr(presigned_backend)
+
+
+def test_http_client_opens_lazily_and_close_releases_it(presigned_backend) -> None:
+    assert presigned_backend._http_client is None
+    client = presigned_backend._http
+    assert presigned_backend._http is client
+
+    presigned_backend.close()
+    assert client.is_closed
+    assert presigned_backend._http_client is None
+    presigned_backend.close()  # idempotent
+
+
+def test_context_manager_closes_client(presigned_backend) -> None:
+    with presigned_backend as backend:
+        client = backend._http
+    assert client.is_closed
+
+
+# ============ _ReadUrlCache ============
+
+
+def _far_future() -> float:
+    return time.time() + 3600
+
+
+def test_url_cache_hit_skips_fetch() -> None:
+    cache = _ReadUrlCache()
+    calls: list[str] = []
+
+    def fetch() -> tuple[dict, float]:
+        calls.append("a")
+        return {"blob": "url-1"}, _far_future()
+
+    assert cache.get_or_fetch("a", fetch, buffer_seconds=0) == {"blob": "url-1"}
+    assert cache.get_or_fetch("a", fetch, buffer_seconds=0) == {"blob": "url-1"}
+    assert calls == ["a"]
+
+
+def test_url_cache_refetches_inside_expiry_buffer() -> None:
+    cache = _ReadUrlCache()
+    results = iter([({"v": 1}, time.time() + 10), ({"v": 2}, _far_future())])
+
+    assert cache.get_or_fetch("a", lambda: next(results), buffer_seconds=60) == {"v": 1}
+    assert cache.get_or_fetch("a", lambda: next(results), buffer_seconds=60) == {"v": 2}
+
+
+def test_url_cache_evicts_least_recently_used() -> None:
+    cache = _ReadUrlCache(max_entries=2)
+    fetched: list[str] = []
+
+    def fetcher(key: str):
+        def fetch() -> tuple[dict, float]:
+            fetched.append(key)
+            return {"key": key}, _far_future()
+        return fetch
+
+    cache.get_or_fetch("a", fetcher("a"), 0)
+    cache.get_or_fetch("b", fetcher("b"), 0)
+    cache.get_or_fetch("a", fetcher("a"), 0)  # touch a, so b is now oldest
+    cache.get_or_fetch("c", fetcher("c"), 0)
+
+    assert list(cache._entries) == ["a", "c"]
+    cache.get_or_fetch("b", fetcher("b"), 0)
+    assert fetched == ["a", "b", "c", "b"]
+
+
+def _run_threads(target: Callable[[], None], count: int) -> list[threading.Thread]:
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def _join_all(threads: list[threading.Thread]) -> None:
+    for thread in threads:
+        thread.join(timeout=5)
+        assert not thread.is_alive(), "waiter hung on the URL cache"
+
+
+def test_url_cache_coalesces_concurrent_misses() -> None:
+    cache = _ReadUrlCache()
+    started = threading.Event()
+    release = threading.Event()
+    fetch_count = 0
+
+    def fetch() -> tuple[dict, float]:
+        nonlocal fetch_count
+        fetch_count += 1
+        started.set()
+        release.wait(timeout=5)
+        return {"blob": "url"}, _far_future()
+
+    results: list[dict] = []
+
+    def worker() -> None:
+        results.append(cache.get_or_fetch("cap:read", fetch, 0))
+
+    leader = _run_threads(worker, 1)
+    assert started.wait(timeout=5)
+    waiters = _run_threads(worker, 7)
+    # Let the waiters reach the in-flight event before the leader finishes
+    time.sleep(0.05)
+    release.set()
+    _join_all(leader + waiters)
+
+    assert fetch_count == 1
+    assert results == [{"blob": "url"}] * 8
+    assert cache._inflight == {}
+
+
+def test_url_cache_waiters_retry_after_leader_failure() -> None:
+    cache = _ReadUrlCache()
+    # An expired entry must not be handed to waiters when the refresh fails
+    cache._entries["cap:read"] = ({"blob": "stale"}, time.time() - 1)
+    started = threading.Event()
+    release = threading.Event()
+    lock = threading.Lock()
+    attempts = 0
+
+    def fetch() -> tuple[dict, float]:
+        nonlocal attempts
+        with lock:
+            attempts += 1
+            first = attempts == 1
+        if first:
+            started.set()
+            release.wait(timeout=5)
+            raise RuntimeError("credential service down")
+        return {"blob": "fresh"}, _far_future()
+
+    results: list[dict] = []
+    errors: list[BaseException] = []
+
+    def worker() -> None:
+        try:
+            results.append(cache.get_or_fetch("cap:read", fetch, 0))
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    leader = _run_threads(worker, 1)
+    assert started.wait(timeout=5)
+    waiters = _run_threads(worker, 4)
+    time.sleep(0.05)
+    release.set()
+    _join_all(leader + waiters)
+
+    assert [str(e) for e in errors] == ["credential service down"]
+    assert results == [{"blob": "fresh"}] * 4
+    assert attempts == 2
+    assert cache._inflight == {}
+
+
+# ============ Batch helpers and write sessions ============
+
+
+class _FakeBackend:
+    """In-memory backend exposing only the single-item protocol methods."""
+
+    def __init__(self) -> None:
+        self.blobs: dict[str, bytes] = {}
+
+    def put_blob(self, capsule_id: str, blob_id: str, data: bytes) -> str:
+        ref = f"capsules/{capsule_id}/blobs/{blob_id}"
+        self.blobs[ref] = data
+        return ref
+
+    def get_blob(self, ref: str) -> bytes:
+        return self.blobs[ref]
+
+
+class _FakeBatchBackend(_FakeBackend):
+    """Fake backend with batch methods and a write session, recording how it was called."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    def put_blobs_batch(self, capsule_id: str, items: Sequence[tuple[str, bytes]]) -> list[str]:
+        self.calls.append("put_blobs_batch")
+        return _run_batch(self.put_blob, [(capsule_id, bid, data) for bid, data in items])
+
+    def get_blobs_batch(self, refs: Sequence[str]) -> list[bytes]:
+        self.calls.append("get_blobs_batch")
+        return _run_batch(self.get_blob, [(ref,) for ref in refs])
+
+    @contextmanager
+    def write_session(self, capsule_id: str, blob_ids: Sequence[str]) -> Iterator[str]:
+        self.calls.append(f"write_session:{capsule_id}:{','.join(blob_ids)}")
+        yield "session"
+
+
+def test_run_batch_preserves_input_order() -> None:
+    def slow_echo(i: int) -> int:
+        # Later items finish first, so completion order is the reverse of input order
+        time.sleep((10 - i) * 0.002)
+        return i
+
+    assert _run_batch(slow_echo, [(i,) for i in range(10)]) == list(range(10))
+
+
+def test_run_batch_raises_first_failure_in_input_order() -> None:
+    def fail_on(i: int) -> int:
+        if i in (3, 7):
+            # The later failure finishes first; the earlier one must still win
+            time.sleep(0.05 if i == 3 else 0)
+            raise ValueError(f"item {i}")
+        return i
+
+    with pytest.raises(ValueError, match="item 3"):
+        _run_batch(fail_on, [(i,) for i in range(10)])
+
+
+@pytest.mark.parametrize("backend_cls", [_FakeBackend, _FakeBatchBackend])
+def test_put_and_get_blobs_round_trip_in_order(backend_cls: type) -> None:
+    backend = backend_cls()
+    items = [(f"b{i}", bytes([i]) * (i + 1)) for i in range(6)]
+
+    refs = put_blobs(backend, "owner/uuid", items)
+    assert refs == [f"capsules/owner/uuid/blobs/b{i}" for i in range(6)]
+    assert get_blobs(backend, refs) == [data for _, data in items]
+
+
+def test_batch_helpers_prefer_backend_batch_methods() -> None:
+    backend = _FakeBatchBackend()
+    refs = put_blobs(backend, "owner/uuid", [("a", b"1"), ("b", b"2")])
+    get_blobs(backend, refs)
+    assert backend.calls == ["put_blobs_batch", "get_blobs_batch"]
+
+
+def test_write_session_falls_back_to_backend() -> None:
+    backend = _FakeBackend()
+    with write_session(backend, "owner/uuid", ["a"]) as session:
+        assert session is backend
+
+
+def test_write_session_uses_backend_session() -> None:
+    backend = _FakeBatchBackend()
+    with write_session(backend, "owner/uuid", ["a", "b"]) as session:
+        assert session == "session"
+    assert backend.calls == ["write_session:owner/uuid:a,b"]
+
+
+class _FakeUploader:
+    """Stands in for a presigned backend's upload methods inside a write session."""
+
+    def __init__(self, fail_on: frozenset[str] = frozenset()) -> None:
+        self.fail_on = fail_on
+        self.documents: list[tuple[dict, str, bytes]] = []
+
+    def _upload_blob(self, urls: dict, capsule_id: str, blob_id: str, data: bytes) -> str:
+        if blob_id in self.fail_on:
+            raise RuntimeError(f"Upload failed: {blob_id}")
+        assert urls["blobs"][blob_id] == f"https://r2.invalid/{blob_id}"
+        return f"capsules/{capsule_id}/blobs/{blob_id}"
+
+    def _upload_document(self, urls: dict, path: str, data: bytes) -> None:
+        self.documents.append((urls, path, data))
+
+
+def _session_urls(blob_ids: Sequence[str]) -> dict:
+    return {"blobs": {bid: f"https://r2.invalid/{bid}" for bid in blob_ids}}
+
+
+def test_write_session_batch_upload_order() -> None:
+    blob_ids = [f"b{i}" for i in range(20)]
+    session = PresignedWriteSession(_FakeUploader(), "owner/uuid", _session_urls(blob_ids))
+
+    refs = session.put_blobs_batch("owner/uuid", [(bid, b"x") for bid in blob_ids])
+    assert refs == [f"capsules/owner/uuid/blobs/{bid}" for bid in blob_ids]
+
+
+def test_write_session_batch_propagates_upload_failure() -> None:
+    blob_ids = [f"b{i}" for i in range(20)]
+    uploader = _FakeUploader(fail_on=frozenset({"b5", "b12"}))
+    session = PresignedWriteSession(uploader, "owner/uuid", _session_urls(blob_ids))
+
+    with pytest.raises(RuntimeError, match="Upload failed: b5"):
+        session.put_blobs_batch("owner/uuid", [(bid, b"x") for bid in blob_ids])
+
+
+def test_write_session_routes_documents_and_rejects_other_capsules() -> None:
+    uploader = _FakeUploader()
+    urls = _session_urls(["a"])
+    session = PresignedWriteSession(uploader, "owner/uuid", urls)
+
+    session.put_document("owner/uuid", "capsule.manifest.json", b"{}")
+    assert uploader.documents == [(urls, "capsule.manifest.json", b"{}")]
+    with pytest.raises(ValueError, match="bound to capsule owner/uuid"):
+        session.put_blob("owner/other", "a", b"x")
+
+
+def _mock_relay(put_status: dict[str, int]) -> tuple[httpx.Client, list[str]]:
+    """httpx client answering /presign with per-blob URLs and PUTs with ``put_status``."""
+    seen: list[str] = []
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            seen.append(f"{request.method} {request.url.path}")
+        if request.url.path == "/presign":
+            blobs = json.loads(request.content).get("blobs", [])
+            return httpx.Response(
+                200,
+                json={"urls": _session_urls(blobs), "expires_at": _far_future()},
+            )
+        blob_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(put_status.get(blob_id, 200))
+
+    return httpx.Client(transport=httpx.MockTransport(handler)), seen
+
+
+def test_presigned_put_blobs_batch_presigns_once() -> None:
+    backend = PresignedUrlBackend("https://relay.invalid", TEST_KEY)
+    backend._http_client, seen = _mock_relay({})
+    blob_ids = [f"b{i}" for i in range(8)]
+
+    with backend:
+        refs = backend.put_blobs_batch("owner/uuid", [(bid, b"x") for bid in blob_ids])
+
+    assert refs == [f"capsules/owner/uuid/blobs/{bid}" for bid in blob_ids]
+    assert seen.count("POST /presign") == 1
+    assert sorted(s for s in seen if s.startswith("PUT")) == sorted(f"PUT /{bid}" for bid in blob_ids)
+
+
+def test_presigned_put_blobs_batch_raises_on_failed_put() -> None:
+    backend = PresignedUrlBackend("https://relay.invalid", TEST_KEY)
+    backend._http_client, _ = _mock_relay({"b3": 500})
+
+    with backend, pytest.raises(RuntimeError, match="Upload failed: 500"):
+        backend.put_blobs_batch("owner/uuid", [(f"b{i}", b"x") for i in range(8)])
+
+
+@pytest.mark.parametrize(
+    "backend, content_type",
+    [
+        (PresignedUrlBackend("https://relay.invalid", TEST_KEY), "application/octet-stream"),
+        # R2 rejects a Content-Type the relay did not sign
+        (EcdsaPresignedUrlBackend("https://relay.invalid", 1, TEST_KEY), None),
+    ],
+    ids=["presigned", "ecdsa"],
+)
+def test_blob_put_headers_follow_the_backend(backend, content_type) -> None:
+    put_headers: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/presign":
+            return httpx.Response(200, json={"urls": _session_urls(["b0"]), "expires_at": _far_future()})
+        put_headers.append(request.headers)
+        return httpx.Response(200)
+
+    backend._http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    with backend:
+        backend.put_blob("owner/uuid", "b0", b"x")
+    assert [h.get("content-type") for h in put_headers] == [content_type]
+
+
+# ============ Stream copies ============
+
+
+@pytest.fixture
+def sendfile_calls(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Record the byte count of every os.sendfile call made by storage."""
+    if not hasattr(os, "sendfile"):
+        pytest.skip("os.sendfile is not available on this platform")
+    calls: list[int] = []
+    real_sendfile = os.sendfile
+
+    def recording_sendfile(out_fd: int, in_fd: int, offset: int, count: int) -> int:
+        sent = real_sendfile(out_fd, in_fd, offset, count)
+        calls.append(sent)
+        return sent
+
+    monkeypatch.setattr(storage.os, "sendfile", recording_sendfile)
+    return calls
+
+
+PAYLOAD = os.urandom(300_000)
+
+
+def _put_stream(tmp_path: Path, stream) -> bytes:
+    backend = LocalDirBackend(tmp_path / "storage")
+    ref = backend.put_blob_stream("owner/uuid", "blob", stream)
+    return backend.get_blob(ref)
+
+
+def test_rolled_over_spool_is_copied_with_sendfile(tmp_path: Path, sendfile_calls: list[int]) -> None:
+    with tempfile.SpooledTemporaryFile(max_size=1024) as spool:
+        # Leave part of the payload in the write buffer; it must be flushed first
+        spool.write(PAYLOAD)
+        spool.seek(100)
+        assert _put_stream(tmp_path, spool) == PAYLOAD[100:]
+    assert sum(sendfile_calls) == len(PAYLOAD) - 100
+
+
+def test_in_memory_streams_use_the_buffered_copy(tmp_path: Path, sendfile_calls: list[int]) -> None:
+    with tempfile.SpooledTemporaryFile(max_size=len(PAYLOAD) + 1) as spool:
+        spool.write(PAYLOAD)
+        spool.seek(0)
+        assert _put_stream(tmp_path / "spool", spool) == PAYLOAD
+        assert not spool._rolled
+    assert _put_stream(tmp_path / "bytesio", io.BytesIO(PAYLOAD)) == PAYLOAD
+    assert sendfile_calls == []
@@ -0,0 +1,78 @@
+"""Unit tests for the on-disk presigned URL cache in anamnesis/url_cache.py."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from namnesis.anamnesis import url_cache
+from namnesis.anamnesis.url_cache import PresignedUrlCache
+
+CAPSULE_ID = "0xowner/0190f0c2-uuid"
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> PresignedUrlCache:
+    return PresignedUrlCache(cache_dir=tmp_path / "cache")
+
+
+def _entries(cache: PresignedUrlCache) -> dict[str, dict]:
+    return {entry["capsule_id"]: entry for entry in cache.iter_cached()}
+
+
+def test_set_layout_is_read_from_the_head_only(
+    cache: PresignedUrlCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expires_at = int(time.time()) + 3600
+    urls = {"blobs": {f"blob{i}": "https://r2.invalid/" + "x" * 200 for i in range(20)}}
+    cache.set(CAPSULE_ID, urls, expires_at)
+
+    def no_full_parse(data: bytes) -> None:
+        raise AssertionError("set() layout should not need a full parse")
+
+    monkeypatch.setattr(url_cache, "json_loads", no_full_parse)
+    entry = _entries(cache)[CAPSULE_ID]
+    assert entry["expires_at"] == expires_at
+    assert entry["status"] == "valid"
+    assert 0 < entry["remaining_seconds"] <= 3600
+
+
+@pytest.mark.parametrize("offset, status", [(3600, "valid"), (-60, "expired")])
+def test_old_layout_falls_back_to_full_parse(
+    cache: PresignedUrlCache, offset: int, status: str
+) -> None:
+    expires_at = int(time.time()) + offset
+    # Earlier releases wrote indented JSON with cached_at and the URL map
+    # ahead of expires_at, pushing it past the head read
+    old = {
+        "cached_at": int(time.time()) - 10,
+        "urls": {"blobs": {f"blob{i}": "https://r2.invalid/" + "x" * 200 for i in range(5)}},
+        "expires_at": expires_at,
+    }
+    (cache.cache_dir / "urls_0xowner_0190f0c2-uuid.json").write_text(
+        json.dumps(old, indent=2), encoding="utf-8"
+    )
+
+    entry = _entries(cache)[CAPSULE_ID]
+    assert entry["expires_at"] == expires_at
+    assert entry["status"] == status
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b'{"cached_at": 1, "urls": {"blobs": {', b"\x80\x81 not json", b"[1, 2, 3]"],
+    ids=["truncated", "binary", "not-an-object"],
+)
+def test_corrupted_file_is_reported(cache: PresignedUrlCache, content: bytes) -> None:
+    (cache.cache_dir / "urls_0xowner_0190f0c2-uuid.json").write_bytes(content)
+
+    assert cache.list_cached() == [{"capsule_id": CAPSULE_ID, "status": "corrupted"}]
+
+
+def test_non_cache_files_are_ignored(cache: PresignedUrlCache) -> None:
+    (cache.cache_dir / "notes.json").write_bytes(b"{}")
+    (cache.cache_dir / "urls_pending.tmp").write_bytes(b"{")
+    assert cache.list_cached() == []
@@ -4,44 +4,58 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import io
 import os
 import re
+import struct
 import time
 import unicodedata
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from pathlib import Path, PurePosixPath
+from pathlib import Path
+from typing import BinaryIO, Iterable
 
 import pytest
 
 
 # Re-implement the functions here to test them in isolation
 # This avoids import issues with the rest of the package
-def sha256_hex(data: bytes) -> str:
+_SHA256_EMPTY = hashlib.sha256()
+
+
+def sha256_hex(data: bytes | BinaryIO) -> str:
+    if hasattr(data, "read"):
+        # Stream file-like input through hashlib's buffered digest loop
+        return hashlib.file_digest(data, "sha256").hexdigest()
     return hashlib.sha256(data).hexdigest()
 
 
+def sha256_hex_iter(chunks: Iterable[bytes]) -> str:
+    h = _SHA256_EMPTY.copy()
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
+
+
 def base64url_encode(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
 
 
 def base64url_decode(value: str) -> bytes:
-    padding = "=" * (-len(value) % 4)
-    return base64.urlsafe_b64decode(value + padding)
+    return base64.urlsafe_b64decode(value + "==="[: -len(value) & 3])
 
 
 def utc_now_rfc3339() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
 
 
 def normalize_relpath(path: Path, root: Path) -> str:
-    rel = path.relative_to(root)
-    posix = PurePosixPath(rel.as_posix())
-    if posix.is_absolute():
+    posix = path.relative_to(root).as_posix()
+    if posix.startswith("/"):
         raise ValueError(f"Path must be relative: {posix}")
-    if any(part == ".." for part in posix.parts):
+    if posix == ".." or posix.startswith("../") or posix.endswith("/..") or "/../" in posix:
         raise ValueError(f"Path must not contain '..': {posix}")
-    normalized = unicodedata.normalize("NFC", str(posix))
+    normalized = unicodedata.normalize("NFC", posix)
     if "\\" in normalized:
         raise ValueError(f"Path must not contain backslashes: {normalized}")
     return normalized
@@ -57,23 +71,14 @@ class UuidV7:
 
 def uuidv7() -> UuidV7:
     ts_ms = int(time.time() * 1000)
-    time_bytes = ts_ms.to_bytes(6, "big")
     rand = int.from_bytes(os.urandom(10), "big")
-    rand_a = (rand >> 68) & 0x0FFF
+    rand_a = rand >> 68  # top 12 bits
     rand_b = (rand >> 6) & ((1 << 62) - 1)
 
-    byte6 = 0x70 | ((rand_a >> 8) & 0x0F)
-    byte7 = rand_a & 0xFF
-    byte8 = 0x80 | ((rand_b >> 56) & 0x3F)
-    bytes9_15 = (rand_b & ((1 << 56) - 1)).to_bytes(7, "big")
-
-    raw = bytearray()
-    raw.extend(time_bytes)
-    raw.append(byte6)
-    raw.append(byte7)
-    raw.append(byte8)
-    raw.extend(bytes9_15)
-    hexed = raw.hex()
+    # 48-bit timestamp | version 7 | 12-bit rand_a, then variant 0b10 | 62-bit rand_b
+    hi = (ts_ms << 16) | 0x7000 | rand_a
+    lo = (0b10 << 62) | rand_b
+    hexed = struct.pack(">QQ", hi, lo).hex()
     uuid = f"{hexed[0:8]}-{hexed[8:12]}-{hexed[12:16]}-{hexed[16:20]}-{hexed[20:32]}"
     return UuidV7(uuid)
 
@@ -89,6 +94,14 @@ class TestSha256Hex:
     def test_simple_input(self) -> None:
         result = sha256_hex(b"hello")
         assert result == "2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824"
+        assert sha256_hex(io.BytesIO(b"hello")) == result
+
+    def test_file_object_matches_bytes(self, tmp_path: Path) -> None:
+        data = os.urandom(300_000)  # larger than file_digest's internal buffer
+        path = tmp_path / "blob.bin"
+        path.write_bytes(data)
+        with path.open("rb") as f:
+            assert sha256_hex(f) == sha256_hex(data)
 
     def test_returns_lowercase(self) -> None:
         result = sha256_hex(b"test")
@@ -96,6 +109,23 @@ class TestSha256Hex:
         assert len(result) == 64
 
 
+class TestSha256HexIter:
+    """Tests for sha256_hex_iter function."""
+
+    def test_no_chunks(self) -> None:
+        assert sha256_hex_iter([]) == sha256_hex(b"")
+
+    def test_matches_single_shot(self) -> None:
+        data = b"hello world" * 1000
+        chunks = [data[i:i + 4096] for i in range(0, len(data), 4096)]
+        assert sha256_hex_iter(chunks) == sha256_hex(data)
+
+    def test_state_not_shared_between_calls(self) -> None:
+        first = sha256_hex_iter([b"a"])
+        second = sha256_hex_iter([b"a"])
+        assert first == second == sha256_hex(b"a")
+
+
 class TestBase64UrlEncode:
     """Tests for base64url_encode function."""
 